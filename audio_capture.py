@@ -0,0 +1,343 @@
+import speech_recognition as sr
+import collections
+import math
+import queue
+import threading
+import time
+
+from frame_analysis import chunk_energies
+from noise_floor import NoiseFloorEstimator
+from noise_profile import NoiseProfileStore, load_or_calibrate
+
+
+class Utterance(sr.AudioData):
+    """Phrase cut from the live capture stream, with its capture timestamps"""
+
+    def __init__(self, frame_data, sample_rate, sample_width, started_at, ended_at, self_speech=0.0):
+        super().__init__(frame_data, sample_rate, sample_width)
+        self.started_at = started_at  # time.monotonic() of the first chunk
+        self.ended_at = ended_at  # time.monotonic() of the last chunk with speech energy
+        self.self_speech = self_speech  # fraction of chunks captured while the assistant was speaking
+
+
+class Segmenter:
+    """Split a continuous stream of audio chunks into phrases
+
+    Uses the same endpointing rules as ``sr.Recognizer.listen`` (energy
+    threshold, pause/phrase thresholds, retained non-speaking audio) but is fed
+    one chunk at a time, so it never has to own the microphone stream. With
+    ``dynamic_energy_threshold`` set, the threshold follows ``noise_floor``,
+    which sees every chunk, speech included.
+
+    With an ``endpointer`` the pause and phrase limits adapt to the command
+    being spoken: it is asked at the first short pause, and again when the
+    phrase limit is reached, whether the command is complete or still
+    waiting for a spoken value.
+
+    A ``phrase_listener`` (see ``streaming.PartialRecognizer``) is told when
+    a phrase starts, gets each of its chunks as they arrive and is told when
+    it ends, so it can decode speech before the endpoint.
+
+    Chunks are tagged when they were captured while the assistant itself
+    was speaking; each utterance carries the fraction of its chunks that
+    were.
+    """
+
+    def __init__(self, recognizer, sample_rate, sample_width, chunk_size, phrase_time_limit=None, noise_floor=None,
+                 endpointer=None, phrase_listener=None):
+        assert recognizer.pause_threshold >= recognizer.non_speaking_duration >= 0
+        self.recognizer = recognizer
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.phrase_time_limit = phrase_time_limit
+        self.seconds_per_buffer = float(chunk_size) / sample_rate
+        self.pause_buffer_count = int(math.ceil(recognizer.pause_threshold / self.seconds_per_buffer))
+        self.phrase_buffer_count = int(math.ceil(recognizer.phrase_threshold / self.seconds_per_buffer))
+        self.non_speaking_buffer_count = int(math.ceil(recognizer.non_speaking_duration / self.seconds_per_buffer))
+        self.noise_floor = noise_floor or NoiseFloorEstimator(
+            self.seconds_per_buffer, recognizer.energy_threshold, recognizer.dynamic_energy_ratio
+        )
+        self.endpointer = endpointer
+        self.phrase_listener = phrase_listener
+        self.in_phrase = False
+        if endpointer is not None:
+            self.probe_buffer_count = max(1, int(math.ceil(endpointer.short_pause / self.seconds_per_buffer)))
+        self.reset()
+
+    def reset(self):
+        """Drop any partial phrase and go back to waiting for speech"""
+        if self.in_phrase and self.phrase_listener is not None:
+            self.phrase_listener.phrase_ended()
+        self.frames = collections.deque()
+        self.tags = collections.deque()  # self-speech tag of each chunk in ``frames``
+        self.in_phrase = False
+        self.pause_count = 0
+        self.phrase_count = 0
+        self.phrase_elapsed = 0
+        self.started_at = None
+        self.last_voiced_at = None
+        self.pause_limit_count = self.pause_buffer_count
+        self.phrase_limit = self.phrase_time_limit
+        self.limit_probed = False
+
+    def feed_block(self, chunks):
+        """Consume a block of (buffer, timestamp, self_speech) chunks; return the utterances that ended in it"""
+        energies = chunk_energies([chunk[0] for chunk in chunks], self.sample_width)
+        utterances = []
+        for (buffer, timestamp, self_speech), energy in zip(chunks, energies):
+            utterance = self._feed(buffer, timestamp, energy, self_speech)
+            if utterance is not None:
+                utterances.append(utterance)
+        return utterances
+
+    def _feed(self, buffer, timestamp, energy, self_speech=False):
+        """Consume one chunk; return an Utterance when a phrase has just ended"""
+        if self.recognizer.dynamic_energy_threshold:
+            self.recognizer.energy_threshold = self.noise_floor.update(energy)
+
+        if self.in_phrase and self._over_limit() and not self._extended_at_limit():
+            # Phrase is too long: cut it here and treat this chunk as the start of the next wait
+            utterance = self._finish()
+            self._wait_for_phrase(buffer, energy, timestamp, self_speech)
+            return utterance
+
+        if not self.in_phrase:
+            self._wait_for_phrase(buffer, energy, timestamp, self_speech)
+            return None
+
+        self.phrase_elapsed += self.seconds_per_buffer
+        self.frames.append(buffer)
+        self.tags.append(self_speech)
+        self.phrase_count += 1
+        if self.phrase_listener is not None:
+            self.phrase_listener.phrase_audio(buffer)
+
+        # Check if speaking has stopped for longer than the pause threshold
+        if energy > self.recognizer.energy_threshold:
+            self.pause_count = 0
+            self.last_voiced_at = timestamp
+        else:
+            self.pause_count += 1
+            if self.endpointer is not None and self.pause_count == self.probe_buffer_count and self._probe():
+                return self._finish()  # the command is complete, no need to wait out the full pause
+        if self.pause_count > self.pause_limit_count:
+            return self._finish()
+        return None
+
+    def _over_limit(self):
+        return bool(self.phrase_limit) and self.phrase_elapsed + self.seconds_per_buffer > self.phrase_limit
+
+    def _extended_at_limit(self):
+        """At the phrase limit, probe once; True if an open slot raised the limit"""
+        if self.endpointer is None or self.limit_probed:
+            return False
+        self.limit_probed = True
+        self._probe()
+        return not self._over_limit()
+
+    def _probe(self):
+        """Ask the endpointer about the phrase so far and apply its limits; True if it is complete"""
+        endpoint = self.endpointer.decide(sr.AudioData(b"".join(self.frames), self.sample_rate, self.sample_width))
+        if endpoint.pause is not None:
+            self.pause_limit_count = int(math.ceil(endpoint.pause / self.seconds_per_buffer))
+        if endpoint.phrase_limit is not None:
+            self.phrase_limit = endpoint.phrase_limit
+        return endpoint.complete
+
+    def _wait_for_phrase(self, buffer, energy, timestamp, self_speech=False):
+        """Keep a short window of leading audio until speech energy shows up"""
+        self.frames.append(buffer)
+        self.tags.append(self_speech)
+        if len(self.frames) > self.non_speaking_buffer_count:
+            self.frames.popleft()
+            self.tags.popleft()
+
+        if energy > self.recognizer.energy_threshold:
+            self.in_phrase = True
+            self.started_at = timestamp - (len(self.frames) - 1) * self.seconds_per_buffer
+            self.pause_count = 0
+            self.phrase_count = 0
+            self.phrase_elapsed = 0
+            self.last_voiced_at = timestamp
+            if self.phrase_listener is not None:
+                self.phrase_listener.phrase_started(self.started_at, self.sample_rate, list(self.frames))
+
+    def _finish(self):
+        """Close the current phrase, returning it if it was long enough"""
+        utterance = None
+        phrase_count = self.phrase_count - self.pause_count  # exclude the trailing pause
+        if phrase_count >= self.phrase_buffer_count:
+            for _ in range(self.pause_count - self.non_speaking_buffer_count):
+                self.frames.pop()  # remove extra non-speaking frames at the end
+                self.tags.pop()
+            utterance = Utterance(b"".join(self.frames), self.sample_rate, self.sample_width,
+                                  self.started_at, self.last_voiced_at, sum(self.tags) / len(self.tags))
+        self.reset()
+        return utterance
+
+
+class AudioCapture:
+    """Always-on microphone capture feeding a bounded queue of utterances
+
+    A callback-mode PyAudio stream pushes every chunk into a ring buffer, so
+    the device keeps being drained whatever the recognizer and command
+    handlers are doing. A separate thread segments the ring into phrases and
+    hands them to ``utterances`` for recognition.
+
+    The noise floor learned for the device is saved to ``profile_store`` on
+    stop and reused at the next start when the first live frames agree with
+    it; a full ``calibration_duration`` calibration only runs after drift.
+
+    ``self_speech()``, when given, is asked for every chunk whether the
+    assistant is speaking. Phrases captured mostly while it was (at least
+    ``self_speech_ratio`` of their chunks) are its own voice picked up by the
+    microphone; they are counted and never queued for recognition.
+
+    ``on_discard(utterance)``, when given, is called from the segmenting
+    thread for every phrase that is skipped or dropped instead of queued,
+    so work started for it early can be undone.
+    """
+
+    def __init__(self, recognizer, device_index=None, sample_rate=None, chunk_size=1024,
+                 ring_seconds=10, queue_size=4, phrase_time_limit=None, calibration_duration=1,
+                 profile_store=None, endpointer=None, phrase_listener=None, self_speech=None,
+                 self_speech_ratio=0.5, on_discard=None):
+        self.recognizer = recognizer
+        self.device_index = device_index
+        self.self_speech = self_speech
+        self.self_speech_ratio = self_speech_ratio
+        self.on_discard = on_discard
+        self.chunk_size = chunk_size
+        self.calibration_duration = calibration_duration
+        self.profile_store = profile_store or NoiseProfileStore()
+
+        self.pyaudio_module = sr.Microphone.get_pyaudio()
+        self.audio = self.pyaudio_module.PyAudio()
+        if device_index is None:
+            self.device_info = self.audio.get_default_input_device_info()
+        else:
+            self.device_info = self.audio.get_device_info_by_index(device_index)
+        self.sample_rate = sample_rate or int(self.device_info["defaultSampleRate"])
+        self.sample_width = self.pyaudio_module.get_sample_size(self.pyaudio_module.paInt16)
+
+        self.segmenter = Segmenter(recognizer, self.sample_rate, self.sample_width, chunk_size, phrase_time_limit,
+                                   endpointer=endpointer, phrase_listener=phrase_listener)
+        self.utterances = queue.Queue(maxsize=queue_size)
+
+        ring_size = int(math.ceil(ring_seconds * self.sample_rate / chunk_size))
+        self._ring = collections.deque(maxlen=ring_size)
+        self._ring_ready = threading.Condition()
+        self._running = False
+        self._stream = None
+        self._thread = None
+
+        # Capture health counters
+        self.frames_captured = 0
+        self.frames_dropped = 0  # chunks evicted from the ring before the segmenter read them
+        self.input_overflows = 0  # callbacks where PortAudio reported a device buffer overflow
+        self.utterances_dropped = 0  # phrases discarded because the recognition queue was full
+        self.self_speech_skipped = 0  # phrases not recognized because they were the assistant's own speech
+
+    def start(self):
+        """Open the microphone stream and start the segmenting thread"""
+        self._running = True
+        self._stream = self.audio.open(
+            input_device_index=self.device_index,
+            channels=1,
+            format=self.pyaudio_module.paInt16,
+            rate=self.sample_rate,
+            frames_per_buffer=self.chunk_size,
+            input=True,
+            stream_callback=self._on_audio,
+        )
+        self._thread = threading.Thread(target=self._run, name="audio-segmenter", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop capturing and release the audio device"""
+        self._running = False
+        with self._ring_ready:
+            self._ring_ready.notify_all()
+        if self._thread:
+            self._thread.join(timeout=2)
+        if self._stream:
+            self._stream.stop_stream()
+            self._stream.close()
+            self._stream = None
+        self.audio.terminate()
+
+        # Remember what was learned about this device's noise for the next start
+        if self.segmenter.noise_floor.energies:
+            try:
+                self.profile_store.save(self.device_info["name"], self.segmenter.noise_floor)
+            except OSError as e:
+                print(f"Could not save noise profile: {e}")
+
+    def stats(self):
+        """Return the capture health counters"""
+        return {
+            'frames_captured': self.frames_captured,
+            'frames_dropped': self.frames_dropped,
+            'input_overflows': self.input_overflows,
+            'utterances_dropped': self.utterances_dropped,
+            'self_speech_skipped': self.self_speech_skipped,
+            'queue_depth': self.utterances.qsize(),
+        }
+
+    def _on_audio(self, in_data, frame_count, time_info, status):
+        """PyAudio callback: only stores the chunk, never blocks on consumers"""
+        if status & self.pyaudio_module.paInputOverflow:
+            self.input_overflows += 1
+        self_speech = self.self_speech is not None and self.self_speech()
+        with self._ring_ready:
+            if len(self._ring) == self._ring.maxlen:
+                self.frames_dropped += 1
+            self._ring.append((in_data, time.monotonic(), self_speech))
+            self._ring_ready.notify()
+        self.frames_captured += 1
+        return (None, self.pyaudio_module.paContinue)
+
+    def _next_chunks(self, timeout=0.5):
+        """Take every chunk waiting in the ring (empty if nothing arrived in time)"""
+        with self._ring_ready:
+            self._ring_ready.wait_for(lambda: self._ring or not self._running, timeout)
+            chunks = list(self._ring)
+            self._ring.clear()
+            return chunks
+
+    def _read_energies(self, duration):
+        """Chunk energies of the next ``duration`` seconds of captured audio"""
+        seconds_per_buffer = float(self.chunk_size) / self.sample_rate
+        energies = []
+        while self._running and len(energies) * seconds_per_buffer < duration:
+            chunks = self._next_chunks()
+            energies.extend(chunk_energies([chunk[0] for chunk in chunks], self.sample_width))
+        return energies
+
+    def _run(self):
+        """Segmenting thread: turn ring-buffer chunks into queued utterances"""
+        if self.calibration_duration:
+            self.recognizer.energy_threshold = load_or_calibrate(
+                self.profile_store, self.device_info["name"], self.segmenter.noise_floor,
+                self._read_energies, calibration_seconds=self.calibration_duration,
+            )
+        while self._running:
+            chunks = self._next_chunks()
+            if not chunks:
+                continue
+            for utterance in self.segmenter.feed_block(chunks):
+                if utterance.self_speech >= self.self_speech_ratio:
+                    self.self_speech_skipped += 1
+                    print(f"Skipping phrase captured while speaking ({utterance.self_speech:.0%} self-speech)")
+                    self._discard(utterance)
+                    continue
+                try:
+                    self.utterances.put_nowait(utterance)
+                except queue.Full:
+                    self.utterances_dropped += 1
+                    print("Recognition queue full, dropping utterance")
+                    self._discard(utterance)
+
+    def _discard(self, utterance):
+        if self.on_discard is not None:
+            self.on_discard(utterance)
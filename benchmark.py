@@ -0,0 +1,431 @@
+import numpy as np
+import os
+import random
+import re
+import select
+import shutil
+import subprocess
+import sys
+import time
+from urllib.parse import quote
+
+from browser_tabs import TabInventory, TabRegistry
+from commands import COMMANDS, WAKE_WORD
+from frame_analysis import analyze_chunks, chunk_energies
+from intents import IntentMatcher
+
+
+def synthetic_speech(seconds, sample_rate=16000, seed=0):
+    """16-bit PCM with background noise and bursts of tone standing in for speech"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    bursts = (np.sin(2 * np.pi * 0.5 * t) > 0.3) * np.sin(2 * np.pi * 220 * t) * 6000
+    samples = bursts + rng.normal(0, 80, len(t))
+    return samples.astype('<i2').tobytes()
+
+
+def cpu_per_audio_second(function, audio_seconds, repeat=5):
+    """Best-of-``repeat`` CPU milliseconds spent per second of audio"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.process_time()
+        function()
+        best = min(best, time.process_time() - start)
+    return best * 1000 / audio_seconds
+
+
+def bench_frame_analysis(seconds=60, sample_rate=16000, chunk_size=1024, block=8):
+    """Chunk energy: per-chunk audioop.rms against the vectorized NumPy analysis, and what the segmenter uses"""
+    data = synthetic_speech(seconds, sample_rate)
+    step = chunk_size * 2
+    chunks = [data[i:i + step] for i in range(0, len(data) - step + 1, step)]
+    results = {}
+
+    try:
+        import audioop
+    except ImportError:
+        audioop = None
+    if audioop is not None:
+        results['audioop.rms per chunk'] = cpu_per_audio_second(
+            lambda: [audioop.rms(chunk, 2) for chunk in chunks], seconds)
+
+    results['numpy, one chunk per call'] = cpu_per_audio_second(
+        lambda: [analyze_chunks([chunk], 2) for chunk in chunks], seconds)
+    results[f'numpy, {block} chunks per call'] = cpu_per_audio_second(
+        lambda: [analyze_chunks(chunks[i:i + block], 2) for i in range(0, len(chunks), block)], seconds)
+    results['numpy, whole buffer'] = cpu_per_audio_second(lambda: analyze_chunks(chunks, 2), seconds)
+    results['chunk_energies, 2 per call'] = cpu_per_audio_second(
+        lambda: [chunk_energies(chunks[i:i + 2], 2) for i in range(0, len(chunks), 2)], seconds)
+
+    print(f"Frame analysis, {seconds}s of {sample_rate} Hz audio in {chunk_size}-sample chunks")
+    for name, cpu_ms in results.items():
+        print(f"  {name:<28} {cpu_ms:8.3f} ms CPU per second of audio")
+    if audioop is None:
+        print("  (audioop is not available on this Python, baseline skipped)")
+
+
+def wall_ms(function, repeat=10):
+    """Median wall-clock milliseconds of ``function``"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+
+def bench_upload_encode(durations=(1, 3, 5), sample_rates=(16000, 48000), uplinks_mbps=(1, 5, 20)):
+    """Per-utterance upload cost of GoogleBackend's FLAC and L16 bodies: encode time plus transfer time
+
+    Transfer time is estimated from the body size at each uplink speed, since
+    the round trip to Google cannot be timed without sending real speech.
+    """
+    import speech_recognition as sr
+    from recognizers import GoogleBackend
+
+    backends = {name: GoogleBackend(sr.Recognizer(), upload_format=name) for name in ("flac", "l16")}
+    print("Upload cost per utterance: encode ms, bytes, encode + transfer ms per uplink")
+    print(f"  {'utterance':<16} {'body':<5} {'encode':>7} {'bytes':>8}"
+          + "".join(f" {f'@{mbps} Mbit/s':>12}" for mbps in uplinks_mbps))
+    for sample_rate in sample_rates:
+        for seconds in durations:
+            audio = sr.AudioData(synthetic_speech(seconds, sample_rate), sample_rate, 2)
+            for name, backend in backends.items():
+                try:
+                    encode_ms = wall_ms(lambda: backend.encode(audio))
+                except OSError:
+                    print(f"  {seconds}s @ {sample_rate:<8} {name:<5} (no flac binary on this machine)")
+                    continue
+                size = len(backend.encode(audio)[0])
+                totals = "".join(f" {encode_ms + size * 8 / (mbps * 1000):>12.1f}" for mbps in uplinks_mbps)
+                print(f"  {seconds}s @ {sample_rate:<8} {name:<5} {encode_ms:>7.1f} {size:>8}{totals}")
+
+
+def transcript_corpus(count, seed=0):
+    """Command-like transcripts: wake word, a command phrase or chatter, and slot values"""
+    rng = random.Random(seed)
+    chatter = "so um the price of this agent looks really good today and I think we should check it".split()
+    values = ["@elonmusk", "2.5", "10 sei", "sei network news", "ai agents on twitter"]
+    transcripts = []
+    for _ in range(count):
+        words = [WAKE_WORD] if rng.random() < 0.9 else []
+        if rng.random() < 0.8:
+            command = rng.choice(COMMANDS)
+            words.append(rng.choice(command.phrases))
+            if command.slot:
+                words.append(rng.choice(values))
+        else:
+            words.extend(rng.sample(chatter, rng.randint(3, 12)))
+        transcripts.append(" ".join(words))
+    return transcripts
+
+
+def legacy_commands(command):
+    """The if/elif phrase chain ``process_command`` used before IntentMatcher: handlers it would run"""
+    command = command.lower()
+    triggered = []
+    if any(phrase in command for phrase in ['should i buy this', 'what do you think about buying', 'is it worth buying']):
+        triggered.append(('buy_recommendation', {}))
+    if 'check this agent' in command:
+        triggered.append(('check_agent', {}))
+    elif 'compare with' in command:
+        triggered.append(('compare', {'username': command.split('compare with @')[-1].strip()}))
+    elif 'show trends' in command:
+        triggered.append(('show_trends', {}))
+    elif 'set price alert' in command:
+        price_match = re.search(r'alert (?:for|at) (\d+(?:\.\d+)?)', command)
+        triggered.append(('set_alert', {'price': float(price_match.group(1)) if price_match else None}))
+    elif 'export data' in command:
+        triggered.append(('export_data', {}))
+    elif any(phrase in command for phrase in ['show top agents', 'show trending agents', 'show agent rankings']):
+        triggered.append(('show_top_agents', {}))
+    elif 'search tweets' in command:
+        triggered.append(('search_tweets', {'query': command.replace('search tweets for', '').replace('search tweets', '').strip()}))
+    if 'show ai analysis' in command:
+        triggered.append(('ai_analysis', {}))
+    if any(phrase in command for phrase in ['swap token', 'swap this token', 'buy token']):
+        amount_match = re.search(r'(\d+(?:\.\d+)?)\s*sei', command)
+        triggered.append(('swap_token', {'amount': float(amount_match.group(1)) if amount_match else 1.0}))
+    return triggered
+
+
+def bench_intent_matching(count=100000):
+    """Transcripts per second: the old phrase chain against the compiled matcher, both with slots"""
+    transcripts = transcript_corpus(count)
+    exact = IntentMatcher(fuzzy=False)
+    fuzzy = IntentMatcher()
+    results = {
+        'if/elif phrase chain': lambda: [legacy_commands(text) for text in transcripts],
+        'compiled phrase regex + slots': lambda: [exact.match(text) for text in transcripts],
+        'same, phonetic fallback on misses': lambda: [fuzzy.match(text) for text in transcripts],
+    }
+    print(f"Intent matching over {count} transcripts")
+    for name, function in results.items():
+        cpu_ms = cpu_per_audio_second(function, 1, repeat=3)
+        print(f"  {name:<46} {count / cpu_ms * 1000:>10.0f} transcripts/s")
+
+
+def _first_output_ms(process, started):
+    """Milliseconds from ``started`` to the first bytes on ``process``'s stdout"""
+    os.read(process.stdout.fileno(), 4096)
+    return (time.perf_counter() - started) * 1000
+
+
+def _drain(process, quiet=0.3):
+    """Read stdout until it has been quiet for ``quiet`` seconds"""
+    while select.select([process.stdout], [], [], quiet)[0]:
+        if not os.read(process.stdout.fileno(), 65536):
+            return
+
+
+def bench_tts_latency(repeat=10, text="Please open a Twitter profile first"):
+    """Time to first audio: an espeak process per message against one persistent espeak on a pipe"""
+    print(f"TTS time to first audio byte over {repeat} messages (median ms)")
+    print(f"  {'process start floor (true)':<32} {wall_ms(lambda: subprocess.run(['true']), repeat):8.1f}")
+    espeak = shutil.which("espeak-ng") or shutil.which("espeak")
+    if espeak is None:
+        print("  (espeak is not installed, synthesis timings skipped)")
+        return
+
+    spawned = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        process = subprocess.Popen([espeak, "--stdout", text], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        spawned.append(_first_output_ms(process, started))
+        process.kill()
+        process.wait()
+
+    process = subprocess.Popen([espeak, "--stdout"], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL)
+    persistent = []
+    for i in range(repeat + 1):
+        started = time.perf_counter()
+        process.stdin.write((text + "\n").encode())
+        process.stdin.flush()
+        elapsed = _first_output_ms(process, started)
+        if i:  # the first message also pays for starting the engine
+            persistent.append(elapsed)
+        _drain(process)
+    process.stdin.close()
+    process.kill()
+    process.wait()
+
+    print(f"  {'spawn per message':<32} {sorted(spawned)[len(spawned) // 2]:8.1f}")
+    print(f"  {'persistent process, pipe write':<32} {sorted(persistent)[len(persistent) // 2]:8.1f}")
+
+
+def legacy_tab_scan(driver):
+    """URLs of every tab the way the handlers used to read them: switch to each window in turn"""
+    urls = []
+    for handle in driver.window_handles:
+        driver.switch_to.window(handle)
+        urls.append(driver.current_url)
+    return urls
+
+
+def _synthetic_devtools(count):
+    """Local HTTP server answering ``/json/list`` with ``count`` page targets; returns (server, address)"""
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    targets = json.dumps([
+        {'id': f"{i:032X}", 'type': "page", 'title': f"Tab {i}",
+         'url': f"https://x.com/user{i}" if i % 3 else f"https://dexscreener.com/seiv2/0x{i:040x}"}
+        for i in range(count)
+    ]).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(targets)))
+            self.end_headers()
+            self.wfile.write(targets)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"127.0.0.1:{server.server_port}"
+
+
+def bench_tab_inventory(count=60, debugger_address="127.0.0.1:9222"):
+    """Reading every tab's URL: switch_to.window per tab against one DevTools /json/list request"""
+    inventory = TabInventory(debugger_address)
+    try:
+        inventory.tabs()
+    except ConnectionError:
+        server, address = _synthetic_devtools(count)
+        print(f"No Chrome at {debugger_address}; timing the inventory against a local /json/list "
+              f"with {count} targets (window switching skipped)")
+        print(f"  {'one /json/list request':<28} {wall_ms(TabInventory(address).tabs):8.2f} ms")
+        server.shutdown()
+        return
+
+    driver = _attach_chrome(debugger_address)
+    opened = []
+    for i in range(max(0, count - len(driver.window_handles))):
+        driver.switch_to.new_window('tab')
+        driver.get(f"data:text/html,<title>benchmark tab {i}</title>")
+        opened.append(driver.current_window_handle)
+    try:
+        tabs = len(driver.window_handles)
+        print(f"Reading the URL of every tab, {tabs} tabs open (median ms)")
+        print(f"  {'switch_to.window per tab':<28} {wall_ms(lambda: legacy_tab_scan(driver), repeat=5):8.2f}")
+        print(f"  {'one /json/list request':<28} {wall_ms(inventory.tabs):8.2f}")
+        registry = TabRegistry(debugger_address)
+        if registry.start():
+            print(f"  {'event-fed TabRegistry':<28} {wall_ms(registry.tabs):8.2f}")
+            registry.stop()
+    finally:
+        for handle in opened:
+            driver.switch_to.window(handle)
+            driver.close()
+
+
+def _attach_chrome(debugger_address):
+    """WebDriver attached to the Chrome at ``debugger_address``, or None if there is none"""
+    try:
+        TabInventory(debugger_address).tabs()
+    except ConnectionError:
+        return None
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    options.add_experimental_option("debuggerAddress", debugger_address)
+    return webdriver.Chrome(options=options)
+
+
+def bench_navigation(frontend_url=None, debugger_address="127.0.0.1:9222", sleep=2):
+    """Opening a frontend page: webbrowser.open plus a fixed sleep against readiness-driven Navigator.open"""
+    import webbrowser
+    from navigation import Navigator
+
+    frontend_url = frontend_url or os.getenv('FRONTEND_URL', 'http://localhost:5003')
+    driver = _attach_chrome(debugger_address)
+    if driver is None:
+        print(f"No Chrome at {debugger_address}, navigation benchmark skipped")
+        return
+    navigator = Navigator(driver)
+    pages = ["/", "/top-agents", "/search-tweets", "/?search=cookiedotfun"]
+
+    print(f"Opening pages of {frontend_url} (ms until the handler can use the page)")
+    print(f"  {'page':<24} {'open + sleep':>12} {'ready then?':>12} {'Navigator':>10}")
+    for page in pages:
+        url = frontend_url + page
+        started = time.perf_counter()
+        webbrowser.open(url)
+        time.sleep(sleep)
+        driver.switch_to.window(driver.window_handles[-1])
+        legacy_ms = (time.perf_counter() - started) * 1000
+        ready = driver.execute_script("return document.documentElement.dataset.agentxReady === 'true';")
+        driver.close()
+        driver.switch_to.window(driver.window_handles[0])
+
+        started = time.perf_counter()
+        navigator.open(url, app=True)
+        navigator_ms = (time.perf_counter() - started) * 1000
+        driver.close()
+        driver.switch_to.window(driver.window_handles[0])
+        print(f"  {page:<24} {legacy_ms:>12.0f} {'yes' if ready else 'no':>12} {navigator_ms:>10.0f}")
+
+
+def _agent_page():
+    """A data: URL page with the element ids of an AgentDetails.js panel"""
+    from page_metrics import AGENT_METRICS
+    panel = "".join(f'<span id="{metric.element_id}">{"cookie" if metric.kind == "text" else "+1,234.5%"}</span>'
+                    for metric in AGENT_METRICS)
+    return "data:text/html," + quote(f'<div class="agent-details">{panel}</div>')
+
+
+def bench_page_metrics(debugger_address="127.0.0.1:9222", repeat=20):
+    """Reading an agent's metrics: one find_element and .text per value against one execute_script"""
+    from selenium.webdriver.common.by import By
+    from page_metrics import AGENT_METRICS, read_agent_metrics
+
+    driver = _attach_chrome(debugger_address)
+    if driver is None:
+        print(f"No Chrome at {debugger_address}, page-metrics benchmark skipped")
+        return
+    driver.switch_to.new_window('tab')
+    driver.get(_agent_page())
+    try:
+        legacy = wall_ms(lambda: [driver.find_element(By.ID, metric.element_id).text for metric in AGENT_METRICS],
+                         repeat)
+        extracted = wall_ms(lambda: read_agent_metrics(driver), repeat)
+    finally:
+        driver.close()
+        driver.switch_to.window(driver.window_handles[0])
+    print(f"Reading {len(AGENT_METRICS)} metrics ({2 * len(AGENT_METRICS)} vs 1 WebDriver round trips)")
+    print(f"  find_element + text: {legacy:.1f} ms")
+    print(f"  execute_script:      {extracted:.1f} ms")
+
+
+# The contract search form as the old handler drove it, and a stub of the app's command API
+_FORM_PAGE = """<input type="radio" id="contract-search-radio">
+<form onsubmit="event.preventDefault(); this.dataset.searched = 'true';">
+<input id="contract-search-input"></form>
+<script>window.agentx = {contractSearch: async (address) => ({ok: true, agentName: address})};</script>"""
+
+
+def bench_frontend_bridge(debugger_address="127.0.0.1:9222", repeat=20, address="0xc0041ef357"):
+    """One voice command against the page: WebDriverWait/click/send_keys chain against one agentx call"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.keys import Keys
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    from navigation import call_app
+
+    driver = _attach_chrome(debugger_address)
+    if driver is None:
+        print(f"No Chrome at {debugger_address}, frontend-bridge benchmark skipped")
+        return
+
+    def click_chain():
+        WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.ID, "contract-search-radio"))).click()
+        contract_input = WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.ID, "contract-search-input")))
+        contract_input.clear()
+        contract_input.send_keys(address)
+        contract_input.send_keys(Keys.RETURN)
+
+    driver.switch_to.new_window('tab')
+    driver.get("data:text/html," + quote(_FORM_PAGE))
+    try:
+        chain = wall_ms(click_chain, repeat)
+        bridge = wall_ms(lambda: call_app(driver, 'contractSearch', address), repeat)
+    finally:
+        driver.close()
+        driver.switch_to.window(driver.window_handles[0])
+    print("Contract search command (page work excluded)")
+    print(f"  click chain:  {chain:.1f} ms")
+    print(f"  agentx call:  {bridge:.1f} ms")
+
+
+BENCHMARKS = {
+    'frame-analysis': bench_frame_analysis,
+    'upload-encode': bench_upload_encode,
+    'intent-matching': bench_intent_matching,
+    'tts-latency': bench_tts_latency,
+    'tab-inventory': bench_tab_inventory,
+    'navigation': bench_navigation,
+    'page-metrics': bench_page_metrics,
+    'frontend-bridge': bench_frontend_bridge,
+}
+
+
+def main():
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark '{name}'. Available: {', '.join(BENCHMARKS)}")
+            continue
+        BENCHMARKS[name]()
+        print()
+
+
+if __name__ == "__main__":
+    main()
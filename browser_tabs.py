@@ -0,0 +1,210 @@
+import collections
+import itertools
+import json
+import re
+import threading
+import time
+from urllib.error import URLError
+from urllib.request import urlopen
+
+# An open page: ``id`` is the DevTools target id, which is also its WebDriver
+# window handle; ``kind`` is "twitter", "dexscreener" or None and ``value`` the
+# username or contract address found in its URL
+Tab = collections.namedtuple('Tab', ['id', 'url', 'title', 'kind', 'value'])
+
+_TWITTER = re.compile(r'^https?://(?:www\.|mobile\.)?(?:twitter|x)\.com/([^/?#]+)', re.I)
+_DEXSCREENER = re.compile(r'^https?://(?:www\.)?dexscreener\.com/[^/?#]+/([^/?#]+)', re.I)
+
+# First path segments of x.com pages that are not profiles
+TWITTER_RESERVED_PATHS = {
+    'home', 'explore', 'search', 'notifications', 'messages', 'settings', 'i', 'compose', 'login', 'logout',
+    'signup', 'tos', 'privacy', 'hashtag', 'intent', 'share',
+}
+
+
+def classify(url):
+    """``(kind, value)`` for a Twitter profile or DexScreener pair URL, ``(None, None)`` otherwise"""
+    match = _TWITTER.search(url)
+    if match and match.group(1).lower() not in TWITTER_RESERVED_PATHS:
+        return "twitter", match.group(1)
+    match = _DEXSCREENER.search(url)
+    if match:
+        return "dexscreener", match.group(1)
+    return None, None
+
+
+class TabInventory:
+    """Every open page with its URL and title, from one DevTools ``/json/list`` request
+
+    Unlike walking ``driver.window_handles`` with ``switch_to.window``, this
+    costs a single HTTP round trip whatever the number of tabs and never
+    changes which tab is focused. Chrome lists pages most recently activated
+    first, so the first match of a kind is the one the user last looked at.
+    """
+
+    def __init__(self, debugger_address="127.0.0.1:9222", timeout=2):
+        self.url = f"http://{debugger_address}/json/list"
+        self.timeout = timeout
+
+    def tabs(self):
+        """Open pages, most recently activated first; extension pages are left out"""
+        try:
+            with urlopen(self.url, timeout=self.timeout) as response:
+                targets = json.loads(response.read().decode("utf-8"))
+        except (URLError, OSError, ValueError) as e:
+            raise ConnectionError(f"DevTools endpoint {self.url} unavailable: {e}")
+        tabs = []
+        for target in targets:
+            if target.get("type") != "page" or target.get("url", "").startswith("chrome-extension://"):
+                continue
+            kind, value = classify(target["url"])
+            tabs.append(Tab(target["id"], target["url"], target.get("title", ""), kind, value))
+        return tabs
+
+    def close(self, target_id):
+        """Close a tab through DevTools without focusing it; True if it was closed"""
+        try:
+            with urlopen(self.url.replace("/json/list", f"/json/close/{target_id}"), timeout=self.timeout):
+                return True
+        except (URLError, OSError):
+            return False
+
+    def find(self, kind):
+        """Every open tab of ``kind``, most recently activated first"""
+        return [tab for tab in self.tabs() if tab.kind == kind]
+
+    def first(self, kind):
+        """The most recently activated tab of ``kind``, or None"""
+        matches = self.find(kind)
+        return matches[0] if matches else None
+
+
+# Installed in every page: calls the DevTools binding when the page is shown or focused.
+# On a new document it also reports a page that opens focused (a tab the user just opened).
+_FOCUS_BINDING = "__agentxTabFocused"
+_FOCUS_SCRIPT = """(function (reportNow) {
+    if (window.__agentxFocusInstalled) return;
+    window.__agentxFocusInstalled = true;
+    const report = () => { if (document.visibilityState === 'visible') window.%s(''); };
+    window.addEventListener('focus', report);
+    document.addEventListener('visibilitychange', report);
+    if (reportNow && document.hasFocus()) report();
+})(%s);"""
+
+
+class TabRegistry(TabInventory):
+    """Open pages kept in memory from DevTools target events, with the order the user focused them
+
+    A background thread holds a browser-level DevTools websocket with
+    target discovery on: ``Target.targetCreated``, ``targetInfoChanged``
+    and ``targetDestroyed`` keep the map of target id to Tab current, so
+    lookups never leave the process. Each page is attached to and gets a
+    small script that reports, through a ``Runtime`` binding, when it is
+    shown or focused; tabs are ordered by that time, seeded at start from
+    the order of ``/json/list``.
+
+    Until ``start`` succeeds, or after the connection drops, lookups fall
+    back to one ``/json/list`` request like ``TabInventory``.
+    """
+
+    def __init__(self, debugger_address="127.0.0.1:9222", timeout=2):
+        super().__init__(debugger_address, timeout)
+        self.version_url = f"http://{debugger_address}/json/version"
+        self.lock = threading.Lock()
+        self.entries = {}  # target id -> Tab
+        self.activated = {}  # target id -> when the user last showed or focused it
+        self.sessions = {}  # DevTools session id -> target id
+        self.connected = False
+        self._socket = None
+        self._send_lock = threading.Lock()
+        self._message_ids = itertools.count(1)
+        self._thread = None
+
+    def start(self):
+        """Connect and load the current tabs; False (and lookups per call) if that fails"""
+        try:
+            import websocket  # websocket-client
+        except ImportError:
+            print("websocket-client is not installed, reading tabs per command")
+            return False
+        try:
+            with urlopen(self.version_url, timeout=self.timeout) as response:
+                browser_url = json.loads(response.read().decode("utf-8"))["webSocketDebuggerUrl"]
+            tabs = super().tabs()
+            self._socket = websocket.create_connection(browser_url, timeout=self.timeout, suppress_origin=True)
+        except (ConnectionError, URLError, OSError, ValueError, KeyError, websocket.WebSocketException) as e:
+            print(f"Tab events unavailable ({e}), reading tabs per command")
+            return False
+        self._socket.settimeout(None)
+
+        with self.lock:
+            for rank, tab in enumerate(tabs):
+                self.entries[tab.id] = tab
+                self.activated[tab.id] = -rank  # before any focus seen live, in /json/list order
+        self.connected = True
+        self._thread = threading.Thread(target=self._run, name="tab-registry", daemon=True)
+        self._thread.start()
+        self._send("Target.setDiscoverTargets", {'discover': True})
+        return True
+
+    def stop(self):
+        self.connected = False
+        if self._socket is not None:
+            self._socket.close()
+
+    def tabs(self):
+        """Open pages, most recently shown or focused first"""
+        if not self.connected:
+            return super().tabs()
+        with self.lock:
+            return sorted(self.entries.values(), key=lambda tab: self.activated.get(tab.id, 0), reverse=True)
+
+    def _send(self, method, params, session_id=None):
+        message = {'id': next(self._message_ids), 'method': method, 'params': params}
+        if session_id is not None:
+            message['sessionId'] = session_id
+        with self._send_lock:
+            self._socket.send(json.dumps(message))
+
+    def _run(self):
+        try:
+            while self.connected:
+                message = json.loads(self._socket.recv())
+                if 'method' in message:
+                    self._handle(message['method'], message.get('params', {}), message.get('sessionId'))
+        except Exception as e:
+            if self.connected:
+                print(f"Tab events stopped ({e}), reading tabs per command")
+        self.connected = False
+
+    def _handle(self, method, params, session_id):
+        if method in ("Target.targetCreated", "Target.targetInfoChanged"):
+            info = params['targetInfo']
+            if info.get('type') != "page" or info.get('url', "").startswith("chrome-extension://"):
+                return
+            kind, value = classify(info['url'])
+            with self.lock:
+                self.entries[info['targetId']] = Tab(info['targetId'], info['url'], info.get('title', ""), kind, value)
+                self.activated.setdefault(info['targetId'], 0)  # opened after start: ahead of the seeded order
+            if method == "Target.targetCreated":
+                self._send("Target.attachToTarget", {'targetId': info['targetId'], 'flatten': True})
+        elif method == "Target.targetDestroyed":
+            with self.lock:
+                self.entries.pop(params['targetId'], None)
+                self.activated.pop(params['targetId'], None)
+        elif method == "Target.attachedToTarget":
+            session = params['sessionId']
+            with self.lock:
+                self.sessions[session] = params['targetInfo']['targetId']
+            self._send("Runtime.addBinding", {'name': _FOCUS_BINDING}, session)
+            self._send("Page.addScriptToEvaluateOnNewDocument",
+                       {'source': _FOCUS_SCRIPT % (_FOCUS_BINDING, "true")}, session)
+            self._send("Runtime.evaluate", {'expression': _FOCUS_SCRIPT % (_FOCUS_BINDING, "false")}, session)
+        elif method == "Target.detachedFromTarget":
+            with self.lock:
+                self.sessions.pop(params.get('sessionId'), None)
+        elif method == "Runtime.bindingCalled" and params.get('name') == _FOCUS_BINDING:
+            with self.lock:
+                target = self.sessions.get(session_id)
+                if target in self.entries:
+                    self.activated[target] = time.monotonic()
@@ -0,0 +1,181 @@
+import queue
+import threading
+import time
+
+
+class CommandCancelled(BaseException):
+    """Raised inside a handler at its next checkpoint once its job is cancelled or out of time
+
+    Like ``asyncio.CancelledError`` it is not an ``Exception``, so the
+    handlers' own ``except Exception`` blocks don't swallow it.
+    """
+
+
+class Job:
+    """One queued handler call"""
+
+    def __init__(self, name, function, kwargs, phrase, timeout):
+        self.name = name
+        self.function = function
+        self.kwargs = kwargs
+        self.phrase = phrase  # start time of the utterance it came from, so its jobs can be found together
+        self.timeout = timeout
+        self.submitted_at = time.monotonic()
+        self.started_at = None
+        self.finished_at = None
+        self.outcome = None  # "done", "failed", "cancelled" or "timeout"
+        self.cancel_reason = None
+        self._cancelled = threading.Event()
+
+    def cancel(self, reason="cancelled"):
+        if not self._cancelled.is_set():
+            self.cancel_reason = reason
+            self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def check(self):
+        """Raise CommandCancelled if the job was cancelled or has run past its timeout"""
+        if self.started_at is not None and self.timeout and time.monotonic() - self.started_at > self.timeout:
+            self.cancel("timeout")
+        if self._cancelled.is_set():
+            raise CommandCancelled(self.cancel_reason)
+
+    def wait(self, seconds):
+        """Sleep up to ``seconds``, waking early (and raising) when cancelled"""
+        remaining = seconds
+        if self.timeout and self.started_at is not None:
+            remaining = min(seconds, max(0, self.started_at + self.timeout - time.monotonic()))
+        self._cancelled.wait(remaining)
+        self.check()
+
+
+class CommandExecutor:
+    """Run command handlers on a worker thread, one at a time, off the listen loop
+
+    Handlers share one browser driver, so jobs run in order on a single
+    worker. Cancellation is cooperative: handlers call ``checkpoint``,
+    ``sleep`` and ``cancellable`` conditions, which raise ``CommandCancelled``
+    once their job is cancelled or past its timeout. Submitting with
+    ``preempt`` cancels the jobs of every other phrase, running or queued,
+    so a new command replaces a stale one.
+
+    ``on_done(job)`` is called on the worker after every job.
+    """
+
+    def __init__(self, on_done=None):
+        self.on_done = on_done
+        self.jobs = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending = []
+        self._current = None
+        self._running = True
+        self._counts = {'done': 0, 'failed': 0, 'cancelled': 0, 'timeout': 0}
+        self._total_wait = 0.0
+        self._total_run = 0.0
+        self._max_run = 0.0
+        self._thread = threading.Thread(target=self._run, name="command-executor", daemon=True)
+        self._thread.start()
+
+    def submit(self, name, function, kwargs=None, phrase=None, timeout=30, preempt=True):
+        """Queue ``function(**kwargs)`` and return its Job"""
+        job = Job(name, function, kwargs or {}, phrase, timeout)
+        with self._lock:
+            if preempt:
+                for other in self._pending + [self._current]:
+                    if other is not None and other.phrase != phrase:
+                        other.cancel("preempted")
+            self._pending.append(job)
+        self.jobs.put(job)
+        return job
+
+    def cancel(self, phrase=None, reason="cancelled"):
+        """Cancel every running and queued job (only those of ``phrase`` if given); return how many"""
+        with self._lock:
+            jobs = [job for job in self._pending + [self._current]
+                    if job is not None and not job.cancelled and (phrase is None or job.phrase == phrase)]
+        for job in jobs:
+            job.cancel(reason)
+        return len(jobs)
+
+    def current_job(self):
+        """The job being run, when called from a handler on the worker thread"""
+        if threading.current_thread() is self._thread:
+            return self._current
+        return None
+
+    def checkpoint(self):
+        job = self.current_job()
+        if job is not None:
+            job.check()
+
+    def sleep(self, seconds):
+        """``time.sleep`` that a handler's cancellation interrupts"""
+        job = self.current_job()
+        if job is None:
+            time.sleep(seconds)
+        else:
+            job.wait(seconds)
+
+    def cancellable(self, condition):
+        """Wrap a polling condition (e.g. for WebDriverWait) to stop once the job is cancelled"""
+        def check(*args):
+            self.checkpoint()
+            return condition(*args)
+        return check
+
+    def stop(self):
+        self._running = False
+        self.cancel(reason="shutdown")
+        self.jobs.put(None)
+        self._thread.join(timeout=2)
+
+    def stats(self):
+        """Queue depth, job outcomes and wait/run latencies"""
+        with self._lock:
+            finished = sum(self._counts.values())
+            return {
+                'queue_depth': len(self._pending),
+                'running': self._current.name if self._current else None,
+                **self._counts,
+                'mean_wait_ms': round(self._total_wait * 1000 / finished, 1) if finished else None,
+                'mean_run_ms': round(self._total_run * 1000 / finished, 1) if finished else None,
+                'max_run_ms': round(self._max_run * 1000, 1),
+            }
+
+    def _run(self):
+        while self._running:
+            job = self.jobs.get()
+            if job is None:
+                break
+            with self._lock:
+                self._pending.remove(job)
+                self._current = job
+            job.started_at = time.monotonic()
+            try:
+                if job.cancelled:
+                    raise CommandCancelled(job.cancel_reason)
+                job.function(**job.kwargs)
+                job.outcome = "done"
+            except CommandCancelled:
+                job.outcome = "timeout" if job.cancel_reason == "timeout" else "cancelled"
+            except Exception as e:
+                job.outcome = "failed"
+                print(f"Command {job.name} failed: {e}")
+            job.finished_at = time.monotonic()
+
+            wait = job.started_at - job.submitted_at
+            run = job.finished_at - job.started_at
+            with self._lock:
+                self._current = None
+                self._counts[job.outcome] += 1
+                self._total_wait += wait
+                self._total_run += run
+                self._max_run = max(self._max_run, run)
+                depth = len(self._pending)
+            print(f"Command {job.name} {job.outcome} after {run * 1000:.0f} ms "
+                  f"(queued {wait * 1000:.0f} ms, {depth} waiting)")
+            if self.on_done is not None:
+                self.on_done(job)
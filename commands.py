@@ -0,0 +1,54 @@
+import collections
+
+WAKE_WORD = "cookie"
+
+# What the cloud recognizer commonly hears instead of the wake word
+WAKE_WORD_VARIANTS = ("cookies", "cooking", "cooky", "kooky", "cookey", "cook e", "cookie's")
+
+# Fillers sometimes transcribed before the wake word
+WAKE_WORD_FILLERS = ("hey", "ok", "okay", "oh", "a", "the")
+
+# A voice command: handler name, the phrases that trigger it and the free-form
+# value (if any) spoken after the phrase
+Command = collections.namedtuple('Command', ['name', 'phrases', 'slot'])
+
+COMMANDS = [
+    Command('buy_recommendation', ('should i buy this', 'what do you think about buying', 'is it worth buying'), None),
+    Command('check_agent', ('check this agent',), None),
+    Command('compare', ('compare with',), 'username'),
+    Command('show_trends', ('show trends',), None),
+    Command('set_alert', ('set price alert',), 'price'),
+    Command('export_data', ('export data',), None),
+    Command('show_top_agents', ('show top agents', 'show trending agents', 'show agent rankings'), None),
+    Command('search_tweets', ('search tweets', 'search tweets for'), 'query'),
+    Command('ai_analysis', ('show ai analysis',), None),
+    Command('swap_token', ('swap token', 'swap this token', 'buy token'), 'amount'),
+    Command('cancel', ('cancel', 'never mind', 'stop'), None),
+]
+
+# Commands that only count when spoken right after the wake word, and are never matched by sound:
+# a stray "stop" or "cancel" later in a phrase must not abort the running command
+STRICT_COMMANDS = ('cancel',)
+
+# Longest phrase (seconds) to allow once a command's free-form value is being spoken
+SLOT_TIME_LIMITS = {
+    'username': 6,
+    'price': 6,
+    'amount': 6,
+    'query': 12,
+}
+
+
+def grammar_phrases():
+    """Every complete command utterance, wake word included"""
+    return [f"{WAKE_WORD} {phrase}" for command in COMMANDS for phrase in command.phrases]
+
+
+def jsgf_grammar(name):
+    """JSGF grammar accepting the wake word followed by any command phrase"""
+    alternatives = " | ".join(phrase for command in COMMANDS for phrase in command.phrases)
+    return (
+        "#JSGF V1.0;\n"
+        f"grammar {name};\n"
+        f"public <{name}> = {WAKE_WORD} ( {alternatives} );\n"
+    )
@@ -0,0 +1,43 @@
+import collections
+
+from commands import SLOT_TIME_LIMITS
+
+# How the segmenter should end the current phrase; None fields keep the defaults
+Endpoint = collections.namedtuple('Endpoint', ['complete', 'pause', 'phrase_limit'])
+
+DEFAULT_ENDPOINT = Endpoint(False, None, None)
+
+
+class SlotAwareEndpointer:
+    """Choose the trailing pause and phrase limit from the command heard so far
+
+    ``probe(audio_data)`` decodes a phrase in progress and returns its
+    ``commands.Command`` or None. After ``short_pause`` seconds of silence
+    the segmenter asks for a decision:
+
+    - a command without a slot is complete, so the phrase ends right away
+    - a command with an open slot (search query, price, ...) waits
+      ``slot_pause`` seconds and may run to its ``slot_limits`` length
+    - anything else keeps the recognizer's ``pause_threshold`` and
+      ``phrase_limit``
+
+    ``phrase_limit`` is the limit a phrase starts with; it defaults to the
+    longest slot limit, since a phrase the probe cannot place (or a backend
+    that cannot probe at all) may still be a long search query.
+    """
+
+    def __init__(self, probe, short_pause=0.3, slot_pause=1.2, slot_limits=None, phrase_limit=None):
+        self.probe = probe
+        self.short_pause = short_pause
+        self.slot_pause = slot_pause
+        self.slot_limits = slot_limits or SLOT_TIME_LIMITS
+        self.phrase_limit = phrase_limit or max(self.slot_limits.values())
+
+    def decide(self, audio_data):
+        """Endpoint for the phrase captured so far"""
+        command = self.probe(audio_data)
+        if command is None:
+            return DEFAULT_ENDPOINT
+        if command.slot is None:
+            return Endpoint(True, None, None)
+        return Endpoint(False, self.slot_pause, self.slot_limits.get(command.slot))
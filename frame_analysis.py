@@ -0,0 +1,93 @@
+import numpy as np
+
+try:
+    import audioop  # removed from the standard library in Python 3.13
+except ImportError:
+    audioop = None
+
+_SAMPLE_TYPES = {1: np.int8, 2: np.dtype('<i2'), 4: np.dtype('<i4')}
+
+
+def pcm_samples(frame_data, sample_width):
+    """Signed integer samples of little-endian PCM bytes"""
+    if sample_width == 3:
+        raw = np.frombuffer(frame_data, dtype=np.uint8).reshape(-1, 3)
+        padded = np.zeros((len(raw), 4), dtype=np.uint8)
+        padded[:, 1:] = raw  # place the 24-bit sample in the top bytes of an int32
+        return padded.view('<i4').ravel() >> 8
+    return np.frombuffer(frame_data, dtype=_SAMPLE_TYPES[sample_width])
+
+
+def block_rms(samples, lengths):
+    """RMS energy of consecutive runs of ``lengths`` samples"""
+    lengths = np.asarray(lengths)
+    values = samples.astype(np.float64)
+    if np.all(lengths == lengths[0]):
+        # Equal-sized chunks (the normal capture case) reshape into a matrix
+        frames = values.reshape(len(lengths), lengths[0])
+        return np.sqrt(np.einsum('ij,ij->i', frames, frames) / lengths[0])
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    return np.sqrt(np.add.reduceat(values * values, offsets) / lengths)
+
+
+def block_zero_crossing_rate(samples, lengths):
+    """Fraction of adjacent sample pairs that change sign, per run of ``lengths`` samples"""
+    lengths = np.asarray(lengths)
+    negative = np.signbit(samples)
+    if np.all(lengths == lengths[0]):
+        frames = negative.reshape(len(lengths), lengths[0])
+        crossings = np.count_nonzero(frames[:, 1:] != frames[:, :-1], axis=1)
+        return crossings / max(lengths[0] - 1, 1)
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    changes = np.concatenate(([0], (negative[1:] != negative[:-1]).astype(np.int64)))
+    changes[offsets] = 0  # don't count the boundary between two runs
+    return np.add.reduceat(changes, offsets) / np.maximum(lengths - 1, 1)
+
+
+class FrameAnalysis:
+    """Per-frame energy, zero-crossing rate and speech decisions for a block of audio
+
+    ``speech`` marks frames whose energy is above the threshold; ``voiced``
+    additionally requires a low zero-crossing rate, which separates vowels
+    and other voiced sounds from fricatives and broadband noise.
+    """
+
+    def __init__(self, energy, zero_crossing_rate, energy_threshold, voiced_zcr=0.25):
+        self.energy = energy
+        self.zero_crossing_rate = zero_crossing_rate
+        self.speech = energy > energy_threshold
+        self.voiced = self.speech & (zero_crossing_rate < voiced_zcr)
+
+
+def analyze_chunks(buffers, sample_width, energy_threshold=0, voiced_zcr=0.25):
+    """Analyze a list of raw audio chunks in one vectorized pass"""
+    if not buffers:
+        return FrameAnalysis(np.zeros(0), np.zeros(0), energy_threshold, voiced_zcr)
+    samples = pcm_samples(b"".join(buffers), sample_width)
+    lengths = [len(buffer) // sample_width for buffer in buffers]
+    return FrameAnalysis(block_rms(samples, lengths), block_zero_crossing_rate(samples, lengths),
+                         energy_threshold, voiced_zcr)
+
+
+def chunk_energies(buffers, sample_width):
+    """RMS energy of each raw chunk, with audioop's C loop where it exists and NumPy otherwise
+
+    The segmenter usually has one or two chunks per wakeup; at that size a
+    NumPy call costs far more than ``audioop.rms``, so NumPy is only the
+    fallback for Pythons without audioop.
+    """
+    if audioop is not None:
+        return [audioop.rms(buffer, sample_width) for buffer in buffers]
+    return analyze_chunks(buffers, sample_width).energy.tolist()
+
+
+def analyze_frames(frame_data, sample_width, frame_size, energy_threshold=0, voiced_zcr=0.25):
+    """Analyze raw audio split into frames of ``frame_size`` samples (a short last frame is dropped)"""
+    samples = pcm_samples(frame_data, sample_width)
+    count = len(samples) // frame_size
+    if count == 0:
+        return FrameAnalysis(np.zeros(0), np.zeros(0), energy_threshold, voiced_zcr)
+    samples = samples[:count * frame_size]
+    lengths = np.full(count, frame_size)
+    return FrameAnalysis(block_rms(samples, lengths), block_zero_crossing_rate(samples, lengths),
+                         energy_threshold, voiced_zcr)
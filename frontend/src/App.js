@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { 
   Box, 
   Container, 
@@ -51,7 +51,11 @@ function App() {
   const [searchQuery, setSearchQuery] = useState('');
   const [agentData, setAgentData] = useState(null);
   const [error, setError] = useState(null);
-  const [loading, setLoading] = useState(false);
+  // Start out loading when the URL asks for a search, so the ready marker below waits for it
+  const [loading, setLoading] = useState(() => {
+    const urlParams = new URLSearchParams(window.location.search);
+    return Boolean(urlParams.get('search') || urlParams.get('contractSearch'));
+  });
   const [interval, setInterval] = useState('_7Days');
   const [compareMode, setCompareMode] = useState(false);
   const [compareData, setCompareData] = useState(null);
@@ -59,6 +63,8 @@ function App() {
   const [showTrends, setShowTrends] = useState(false);
   const [searchMode, setSearchMode] = useState('username');
   const [contractAddress, setContractAddress] = useState('');
+  // The agent of the latest search, set as soon as it loads (state only updates on the next render)
+  const currentAgent = useRef(null);
  
 
   // Initialize speech recognition
@@ -69,22 +75,37 @@ function App() {
   recognition.interimResults = true;
 
   useEffect(() => {
-    // Get search parameter from URL
-    const urlParams = new URLSearchParams(window.location.search);
-    const searchParam = urlParams.get('search');
-    const contractSearch = urlParams.get('contractSearch');
-    
-    // If contract search parameter exists, switch to contract mode and search
-    if (contractSearch) {
-      setSearchMode('contract');
-      setContractAddress(contractSearch);
-      fetchAgentData(contractSearch, 'contract');
-    }
-    // Otherwise if username search parameter exists, trigger search
-    else if (searchParam) {
-      setSearchQuery(searchParam);
-      fetchAgentData(searchParam);
-    }
+    // Search for the agent named in the URL, on load and whenever the route changes in place
+    const searchFromUrl = () => {
+      const urlParams = new URLSearchParams(window.location.search);
+      const searchParam = urlParams.get('search');
+      const contractSearch = urlParams.get('contractSearch');
+
+      // Not ready until the new search has loaded (the marker effect only runs after render),
+      // and a comparison from before the tab was routed is not carried over to the new agent
+      if (contractSearch || searchParam) {
+        document.documentElement.dataset.agentxReady = 'false';
+        setCompareMode(false);
+        setCompareData(null);
+      }
+
+      // If contract search parameter exists, switch to contract mode and search
+      if (contractSearch) {
+        setSearchMode('contract');
+        setContractAddress(contractSearch);
+        fetchAgentData(contractSearch, 'contract');
+      }
+      // Otherwise if username search parameter exists, trigger search
+      else if (searchParam) {
+        setSearchMode('username');
+        setSearchQuery(searchParam);
+        fetchAgentData(searchParam, 'username');
+      }
+    };
+    searchFromUrl();
+
+    // The voice assistant routes its tab with history.pushState and a popstate event
+    window.addEventListener('popstate', searchFromUrl);
     
     // Rest of your useEffect code for speech recognition
     recognition.onresult = (event) => {
@@ -104,10 +125,16 @@ function App() {
 
     // Cleanup
     return () => {
+      window.removeEventListener('popstate', searchFromUrl);
       recognition.stop();
     };
   }, []);
 
+  // Readiness marker for the voice assistant: set once the page has rendered and its search has loaded
+  useEffect(() => {
+    document.documentElement.dataset.agentxReady = loading ? 'false' : 'true';
+  }, [loading]);
+
   const processCommand = async (command) => {
     const cmd = command.toLowerCase();
     
@@ -164,9 +191,17 @@ function App() {
     }
   };
 
+  const showAgent = (agent) => {
+    currentAgent.current = agent;
+    setAgentData(agent);
+    setCompareData(null);
+  };
+
   const fetchAgentData = async (query, mode = searchMode) => {
     setLoading(true);
     setError(null);
+    // Never leave the previous agent on screen (or to the agentx commands) while, or if, this one fails
+    showAgent(null);
     try {
       let endpoint;
       if (mode === 'username') {
@@ -181,16 +216,20 @@ function App() {
       const response = await axios.get(endpoint);
       
       if (response.data.ok) {
-        setAgentData(response.data.ok);
+        showAgent(response.data.ok);
         speakResponse(`Found data for ${response.data.ok.agentName}. Current mindshare is ${response.data.ok.mindshare.toFixed(2)}`);
-      } else {
-        setError('No data found');
+        return { agent: response.data.ok };
       }
+      showAgent(null);
+      setError('No data found');
+      return { error: 'No data found' };
     } catch (err) {
-      setError(err.response?.data?.error?.errorMessage || 'Failed to fetch agent data');
-      if (err.response?.status === 429) {
-        setError('Rate limit exceeded. Please try again later.');
-      }
+      const message = err.response?.status === 429
+        ? 'Rate limit exceeded. Please try again later.'
+        : err.response?.data?.error?.errorMessage || 'Failed to fetch agent data';
+      showAgent(null);
+      setError(message);
+      return { error: message };
     } finally {
       setLoading(false);
     }
@@ -228,8 +267,10 @@ function App() {
     try {
       const response = await axios.get(`${API_URL}/agents/${username}?interval=${interval}`);
       setCompareData(response.data.ok);
+      return response.data.ok ? { agent: response.data.ok } : { error: 'No data found' };
     } catch (err) {
       setError('Failed to fetch comparison data');
+      return { error: 'Failed to fetch comparison data' };
     }
   };
 
@@ -248,29 +289,78 @@ function App() {
     }
   };
 
-  const exportData = () => {
+  const exportData = (agent = agentData) => {
     const csvContent = `
-      Agent Name,${agentData.agentName}
-      Mindshare,${agentData.mindshare}
-      Market Cap,${agentData.marketCap}
-      Price,${agentData.price}
-      24h Volume,${agentData.volume24Hours}
-      Holders,${agentData.holdersCount}
+      Agent Name,${agent.agentName}
+      Mindshare,${agent.mindshare}
+      Market Cap,${agent.marketCap}
+      Price,${agent.price}
+      24h Volume,${agent.volume24Hours}
+      Holders,${agent.holdersCount}
     `.trim();
+    const fileName = `${agent.agentName}_stats.csv`;
 
     const blob = new Blob([csvContent], { type: 'text/csv' });
     const url = window.URL.createObjectURL(blob);
     const a = document.createElement('a');
     a.href = url;
-    a.download = `${agentData.agentName}_stats.csv`;
+    a.download = fileName;
     a.click();
+    return fileName;
   };
 
+  // Shown as an inline confirmation rather than alert(), which would block the page (and WebDriver)
   const setPriceAlertHandler = (price) => {
     setPriceAlert(price);
-    alert(`Alert will be sent when price reaches $${price}`);
   };
 
+  // Command API for the voice assistant, which calls it with execute_async_script instead of
+  // clicking through the form. Every command resolves to {ok: true, ...} or {ok: false, error};
+  // commands on the shown agent use the one the latest search loaded, so run a search first.
+  useEffect(() => {
+    const summary = (agent) => ({ agentName: agent.agentName, mindshare: agent.mindshare, price: agent.price });
+    const result = ({ agent, error }) => (agent ? { ok: true, ...summary(agent) } : { ok: false, error });
+    const noAgent = { ok: false, error: 'No agent is shown' };
+
+    window.agentx = {
+      search: async (username) => {
+        window.history.replaceState({}, '', `/?search=${encodeURIComponent(username)}`);
+        setSearchMode('username');
+        setSearchQuery(username);
+        setCompareMode(false);
+        return result(await fetchAgentData(username, 'username'));
+      },
+      contractSearch: async (address) => {
+        window.history.replaceState({}, '', `/?contractSearch=${encodeURIComponent(address)}`);
+        setSearchMode('contract');
+        setContractAddress(address);
+        setCompareMode(false);
+        return result(await fetchAgentData(address, 'contract'));
+      },
+      compare: async (username) => {
+        const agent = currentAgent.current;
+        if (!agent) return noAgent;
+        setCompareMode(true);
+        const compared = await handleCompare(username);
+        return compared.agent
+          ? { ok: true, agents: [summary(agent), summary(compared.agent)] }
+          : { ok: false, error: compared.error };
+      },
+      setAlert: async (price) => {
+        setPriceAlertHandler(price);
+        return { ok: true, price };
+      },
+      showTrends: async () => {
+        if (!currentAgent.current) return noAgent;
+        setShowTrends(true);
+        return { ok: true, ...summary(currentAgent.current) };
+      },
+      export: async () => (currentAgent.current
+        ? { ok: true, fileName: exportData(currentAgent.current) }
+        : noAgent),
+    };
+  });
+
   // Add chart component
   const MetricsChart = ({ data, metric, color }) => (
     <ResponsiveContainer width="100%" height={300}>
@@ -489,7 +579,7 @@ function App() {
                   id="export-button"
                   variant="outlined"
                   startIcon={<DownloadIcon />}
-                  onClick={exportData}
+                  onClick={() => exportData()}
                   sx={{ mt: 2 }}
                 >
                   Export Data
@@ -514,6 +604,11 @@ function App() {
                       }
                     }}
                   />
+                  {priceAlert && (
+                    <Alert severity="success" className="alert-success" sx={{ mt: 1 }}>
+                      Alert will be sent when price reaches ${priceAlert}
+                    </Alert>
+                  )}
                 </Box>
 
                 {loading && (
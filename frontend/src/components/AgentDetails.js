@@ -41,7 +41,8 @@ const globalStyles = {
   }
 };
 
-const StatCard = ({ title, value, delta, prefix = '' }) => (
+// `id` names the value ("<id>-value") and change ("<id>-delta") elements the voice assistant reads
+const StatCard = ({ id, title, value, delta, prefix = '' }) => (
   <Paper 
     elevation={3}
     sx={{ 
@@ -70,7 +71,7 @@ const StatCard = ({ title, value, delta, prefix = '' }) => (
       {title}
     </Typography>
     <Box>
-      <Typography variant="h5" sx={{ 
+      <Typography id={id && `${id}-value`} variant="h5" sx={{ 
         fontWeight: 600,
         color: '#fff',
         fontSize: '1.5rem'
@@ -79,6 +80,7 @@ const StatCard = ({ title, value, delta, prefix = '' }) => (
       </Typography>
       {delta !== undefined && (
         <Chip
+          id={id && `${id}-delta`}
           size="small"
           icon={delta > 0 ? <TrendingUp sx={{ fontSize: 16 }}/> : <TrendingDown sx={{ fontSize: 16 }}/>}
           label={`${delta > 0 ? '+' : ''}${delta.toFixed(2)}%`}
@@ -99,7 +101,7 @@ const StatCard = ({ title, value, delta, prefix = '' }) => (
 
 const AgentDetails = ({ agent }) => {
   return (
-    <Box sx={{ 
+    <Box className="agent-details" sx={{ 
       width: '100%',
       minHeight: '100vh',
       background: 'linear-gradient(135deg, #000C24 0%, #001433 100%)',
@@ -116,7 +118,7 @@ const AgentDetails = ({ agent }) => {
           border: '1px solid rgba(255,255,255,0.08)',
         }}
       >
-        <Typography variant="h4" sx={{ 
+        <Typography id="agent-name" variant="h4" sx={{ 
           fontWeight: 600,
           fontSize: '2rem',
           color: '#fff',
@@ -139,6 +141,7 @@ const AgentDetails = ({ agent }) => {
       <Grid container spacing={2.5}>
         <Grid item xs={12} sm={6} md={3}>
           <StatCard
+            id="mindshare"
             title="Mindshare"
             value={agent.mindshare.toFixed(2)}
             delta={agent.mindshareDeltaPercent}
@@ -146,6 +149,7 @@ const AgentDetails = ({ agent }) => {
         </Grid>
         <Grid item xs={12} sm={6} md={3}>
           <StatCard
+            id="market-cap"
             title="Market Cap"
             value={agent.marketCap}
             delta={agent.marketCapDeltaPercent}
@@ -154,6 +158,7 @@ const AgentDetails = ({ agent }) => {
         </Grid>
         <Grid item xs={12} sm={6} md={3}>
           <StatCard
+            id="price"
             title="Price"
             value={agent.price.toFixed(4)}
             delta={agent.priceDeltaPercent}
@@ -162,6 +167,7 @@ const AgentDetails = ({ agent }) => {
         </Grid>
         <Grid item xs={12} sm={6} md={3}>
           <StatCard
+            id="liquidity"
             title="Liquidity"
             value={agent.liquidity}
             prefix="$"
@@ -182,6 +188,7 @@ const AgentDetails = ({ agent }) => {
       <Grid container spacing={2.5}>
         <Grid item xs={12} sm={6}>
           <StatCard
+            id="volume"
             title="24h Volume"
             value={agent.volume24Hours}
             delta={agent.volume24HoursDeltaPercent}
@@ -190,6 +197,7 @@ const AgentDetails = ({ agent }) => {
         </Grid>
         <Grid item xs={12} sm={6}>
           <StatCard
+            id="holders"
             title="Holders"
             value={agent.holdersCount}
             delta={agent.holdersCountDeltaPercent}
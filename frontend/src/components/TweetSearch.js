@@ -33,24 +33,39 @@ const TweetSearch = () => {
   const [fromDate, setFromDate] = useState(lastYear.toISOString().split('T')[0]);
   const [toDate, setToDate] = useState(today.toISOString().split('T')[0]);
 
-  // Handle URL query parameter
+  // Readiness marker for the voice assistant (see App.js): set once the search has loaded and rendered.
+  // Declared before the URL effect so the search started on mount clears it again.
   useEffect(() => {
-    const urlParams = new URLSearchParams(window.location.search);
-    const searchQuery = urlParams.get('q');
-    if (searchQuery) {
-      setQuery(searchQuery);
-      // Automatically trigger search with URL parameter
-      handleSearch(new Event('submit'));
-    }
+    document.documentElement.dataset.agentxReady = loading ? 'false' : 'true';
+  }, [loading]);
+
+  // Handle URL query parameter, on load and when the route changes in place
+  useEffect(() => {
+    const searchFromUrl = () => {
+      const urlParams = new URLSearchParams(window.location.search);
+      const searchQuery = urlParams.get('q');
+      if (searchQuery) {
+        // Not ready, and the previous query's results are gone, until the new search has loaded
+        document.documentElement.dataset.agentxReady = 'false';
+        setTweets([]);
+        setQuery(searchQuery);
+        // Automatically trigger search with URL parameter
+        handleSearch(new Event('submit'), searchQuery);
+      }
+    };
+    searchFromUrl();
+    window.addEventListener('popstate', searchFromUrl);
+    return () => window.removeEventListener('popstate', searchFromUrl);
   }, []);
 
-  const handleSearch = async (e) => {
+  const handleSearch = async (e, searchQuery = query) => {
     e.preventDefault();
     setLoading(true);
     setError(null);
+    setTweets([]);
 
     try {
-      const response = await axios.get(`${API_URL}/api/search/${encodeURIComponent(query)}`, {
+      const response = await axios.get(`${API_URL}/api/search/${encodeURIComponent(searchQuery)}`, {
         params: {
           from: fromDate,
           to: toDate
@@ -0,0 +1,146 @@
+import collections
+import re
+
+from commands import COMMANDS, STRICT_COMMANDS, WAKE_WORD, WAKE_WORD_VARIANTS
+from phonetic import PhoneticMatcher
+
+# A matched command: its name, the slot values parsed from the rest of the
+# transcript (None when a slot was not spoken) and the lower-cased transcript
+Intent = collections.namedtuple('Intent', ['name', 'slots', 'text'])
+
+_TOKEN = re.compile(r"[@$]?[\w']+(?:\.\d+)?")
+_NUMBER = re.compile(r"^\$?(\d+(?:\.\d+)?)$")
+
+
+def tokenize(text):
+    """Lower-case word tokens; numbers keep their decimals and usernames their @"""
+    return _TOKEN.findall(text.lower())
+
+
+def _number(tokens):
+    for token in tokens:
+        match = _NUMBER.match(token)
+        if match:
+            return float(match.group(1))
+    return None
+
+
+def parse_username(tokens):
+    """Twitter handle spoken after the phrase: "compare with @ elon musk" -> "elonmusk" """
+    if tokens and tokens[0] == "at":
+        tokens = tokens[1:]
+    username = "".join(tokens).lstrip("@")
+    return username or None
+
+
+def parse_price(tokens):
+    """First number after the phrase ("set price alert at 2.5")"""
+    return _number(tokens)
+
+
+def parse_amount(tokens):
+    """Number of SEI to swap: the number followed by "sei", or the first number"""
+    for token, following in zip(tokens, tokens[1:]):
+        if following == "sei" and _NUMBER.match(token):
+            return _number([token])
+    return _number(tokens)
+
+
+def parse_query(tokens):
+    """Everything spoken after the phrase"""
+    return " ".join(tokens) or None
+
+
+SLOT_PARSERS = {
+    'username': parse_username,
+    'price': parse_price,
+    'amount': parse_amount,
+    'query': parse_query,
+}
+
+
+class IntentMatcher:
+    """Match transcripts against every command phrase in one pass
+
+    All phrases are compiled into a single regular expression, longest
+    first, with any run of punctuation or spaces allowed between words. The
+    leftmost match wins, and at the same position the longest phrase wins,
+    so "search tweets for" beats "search tweets". The tokens after the
+    phrase are handed to the command's slot parser.
+
+    Phrases of ``strict`` commands ("cancel", "stop") only match directly
+    after the wake word, so "cookie search tweets for cancel culture" is a
+    search.
+
+    With ``fuzzy`` set, transcripts without an exact phrase fall back to
+    ``phonetic.PhoneticMatcher``, so "show trens" or "cooky" still match;
+    strict commands are never matched that way.
+    """
+
+    def __init__(self, commands=COMMANDS, slot_parsers=SLOT_PARSERS, fuzzy=True, strict=STRICT_COMMANDS):
+        self.slot_parsers = slot_parsers
+        self.strict = set(strict)
+        self.phonetic = PhoneticMatcher(commands, strict=strict) if fuzzy else None
+        self.phrases = {}
+        for command in commands:
+            for phrase in command.phrases:
+                self.phrases.setdefault(" ".join(tokenize(phrase)), command)  # first command listing a phrase keeps it
+        alternatives = sorted(self.phrases, key=len, reverse=True)
+        # One capture group per phrase, so the group that matched names the command
+        self.group_commands = [None] + [self.phrases[phrase] for phrase in alternatives]
+        self.pattern = re.compile(
+            r"(?<![\w@$'])(?:" + "|".join("(" + r"[^\w@$']+".join(map(re.escape, phrase.split())) + ")"
+                                         for phrase in alternatives)
+            + r")(?![\w'])"
+        )
+
+    def find(self, text):
+        """``(command, end)`` of the leftmost longest phrase in lower-case ``text``, or None"""
+        for match in self.pattern.finditer(text):
+            command = self.group_commands[match.lastindex]
+            if command.name not in self.strict or self._follows_wake_word(text[:match.start()]):
+                return command, match.end()
+        return None
+
+    def _follows_wake_word(self, before):
+        words = tokenize(before)
+        return bool(words) and (words[-1] == WAKE_WORD or words[-1] in WAKE_WORD_VARIANTS)
+
+    def has_wake_word(self, text):
+        """True if ``text`` contains the wake word, or starts with something that sounds like it"""
+        text = text.lower()
+        if WAKE_WORD in text:
+            return True
+        return self.phonetic is not None and self.phonetic.wake_word_position(tokenize(text)) is not None
+
+    def command(self, text):
+        """The Command ``text`` names, or None: what ``match`` dispatches, without parsing its slots"""
+        found = self._locate(text.lower())
+        return found[0] if found is not None else None
+
+    def match(self, text):
+        """The Intent for ``text``, or None if it names no command"""
+        text = text.lower()
+        found = self._locate(text)
+        if found is None:
+            return None
+        command, rest = found
+        slots = {}
+        if command.slot is not None:
+            slots[command.slot] = self.slot_parsers[command.slot](rest)
+        return Intent(command.name, slots, text)
+
+    def _locate(self, text):
+        """``(command, tokens after its phrase)`` for lower-case ``text``, or None"""
+        found = self.find(text)
+        if found is not None:
+            command, end = found
+            return command, tokenize(text[end:])
+        if self.phonetic is None:
+            return None
+        tokens = tokenize(text)
+        found = self.phonetic.find(tokens)
+        if found is None:
+            return None
+        command, end = found
+        return command, tokens[end:]
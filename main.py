@@ -1,24 +1,87 @@
 import speech_recognition as sr
 import subprocess
 import requests
-import webbrowser
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.keys import Keys
 from dotenv import load_dotenv
 import os
-import re
 import time
 import random
 import sys
 import json
+import queue
+
+from audio_capture import AudioCapture
+from browser_tabs import TabRegistry
+from command_executor import CommandExecutor
+from endpointing import SlotAwareEndpointer
+from intents import IntentMatcher
+from navigation import FrontendTab, Navigator
+from page_metrics import describe_trends, read_agent_metrics
+from preprocess import prepare_for_recognition
+from recognizers import create_recognizer
+from speech_output import LOW, NORMAL, URGENT, SpeechOutput
+from streaming import PartialRecognizer
+from tts_backends import create_tts_backend
+from tts_cache import create_cached_backend
+from wake_word import WakeWordSpotter
 
 load_dotenv()
 
+# Said when a phrase has no wake word, one at random
+REMINDERS = (
+    "Just add 'cookie' before your command and I'll help you out!",
+    "Start with 'cookie' and I'll be happy to assist.",
+    "Remember to say 'cookie' first - then I'm all ears!",
+    "Add 'cookie' to the start and let's try that again.",
+    "Quick tip: begin with 'cookie' to activate me.",
+)
+
+# Fixed replies the handlers speak often, rendered into the speech cache at startup with the reminders
+FIXED_PHRASES = (
+    "Cancelled",
+    "Nothing to cancel",
+    "Performing search",
+    "Looking up agent by contract",
+    "Opening top agents rankings",
+    "Showing AI analysis",
+    "Data exported successfully",
+    "Please open a Twitter profile first",
+    "Please open either a Twitter profile or a DexScreener contract page, then try again.",
+    "Please specify what to search for",
+    "No tweets found matching your search",
+    "Still loading results...",
+    "Sorry, I cannot connect to the API server. Please make sure it's running.",
+)
+
+
+# Metrics the buy recommendation is based on, with how they are named when one is missing
+BUY_METRICS = {
+    'mindshareDeltaPercent': "mindshare change",
+    'marketCap': "market cap",
+    'marketCapDeltaPercent': "market cap change",
+    'volume24Hours': "trading volume",
+    'holdersCountDeltaPercent': "holder change",
+    'liquidity': "liquidity",
+}
+
+
+class CancellableWait(WebDriverWait):
+    """WebDriverWait that stops polling as soon as the running command is cancelled or times out"""
+
+    def __init__(self, driver, timeout, executor, poll_frequency=0.5):
+        super().__init__(driver, timeout, poll_frequency=poll_frequency)
+        self.executor = executor
+
+    def until(self, method, message=""):
+        return super().until(self.executor.cancellable(method), message)
+
+
 class VoiceAssistant:
     def __init__(self):
         print("Initializing voice assistant...")
@@ -32,11 +95,74 @@ class VoiceAssistant:
         self.recognizer.pause_threshold = 0.8  # Longer pause threshold
         self.recognizer.phrase_threshold = 0.3  # Lower phrase threshold
         self.recognizer.non_speaking_duration = 0.5  # Shorter non-speaking duration
+
+        # Decode commands offline against the command grammar, Google only for free-text values
+        self.speech_backend = create_recognizer(self.recognizer)
+        print(f"Using {self.speech_backend.name} speech recognition")
+
+        # Local wake word spotter so only phrases starting with "cookie" are sent to Google
+        wake_word_dir = os.getenv('WAKE_WORD_DIR', 'wake_word')
+        self.wake_word = WakeWordSpotter.from_directory(
+            wake_word_dir, sensitivity=float(os.getenv('WAKE_WORD_SENSITIVITY', '0.5'))
+        )
+        if self.wake_word is None:
+            print(f"No wake word recordings in {wake_word_dir}, every phrase will be sent for recognition")
+            print("Run: python wake_word.py enroll")
+        self.normalize_gain = os.getenv('NORMALIZE_GAIN', 'false').lower() == 'true'
+
+        # Early commit: start the work for an unambiguous command from the interim transcript
+        self.early_commit = os.getenv('EARLY_COMMIT', 'true').lower() == 'true'
+        self.prewarmers = {
+            'show_top_agents': self.prewarm_top_agents,
+            'show_trends': self.get_current_twitter_username,
+            'export_data': self.get_current_twitter_username,
+        }
+        self.early_commits = queue.Queue()
+        self.committed_phrase = None  # phrase start of the last early commit (segmenter thread)
+        self.early_committed = {}  # phrase start -> name of the command pre-warmed for it
+        self.discarded_phrases = queue.Queue()  # phrase starts the capture thread dropped unrecognized
+        self.prewarmed = {}  # (phrase start, command name) -> pre-warmed value
+
+        # End of speech and first visible action per phrase, until the latency is reported
+        self.current_phrase = None
+        self.phrase_ends = {}
+        self.first_actions = {}
+
+        # Handlers run one at a time on a worker thread, so listening never waits for the browser
+        self.command_timeout = float(os.getenv('COMMAND_TIMEOUT', '30'))
+        self.executor = CommandExecutor(on_done=self.command_done)
+
+        # Speech is queued and read on its own thread; barge-in stops it when the user starts talking
+        # Fixed messages are played from rendered clips; the reminders are rendered up front
+        self.speech = SpeechOutput(create_cached_backend(create_tts_backend(), phrases=REMINDERS + FIXED_PHRASES))
+        print(f"Using {self.speech.backend.name} speech output")
+        self.barge_in = os.getenv('BARGE_IN', 'false').lower() == 'true'
+
+        # One compiled matcher and one handler per command, slots passed as keyword arguments
+        self.intent_matcher = IntentMatcher()
+        self.command_handlers = {
+            'buy_recommendation': self.handle_buy_recommendation,
+            'check_agent': self.handle_check_agent,
+            'compare': self.handle_compare,
+            'show_trends': self.handle_show_trends,
+            'set_alert': self.handle_set_alert,
+            'export_data': self.handle_export_data,
+            'show_top_agents': self.handle_show_top_agents,
+            'search_tweets': self.handle_search_tweets,
+            'ai_analysis': self.handle_ai_analysis,
+            'swap_token': self.handle_swap_token,
+        }
+        self.slot_prompts = {
+            'username': "Please specify a username to compare with",
+            'price': "Please specify a price for the alert",
+            'query': "Please specify what to search for",
+        }
         
         # Initialize Chrome with debugging options
         print("Connecting to Chrome...")
         chrome_options = Options()
-        chrome_options.add_experimental_option("debuggerAddress", "127.0.0.1:9222")
+        debugger_address = "127.0.0.1:9222"
+        chrome_options.add_experimental_option("debuggerAddress", debugger_address)
         chrome_options.add_argument("--remote-debugging-port=9222")
         try:
             print("Attempting to connect to Chrome (timeout: 10s)...")
@@ -48,155 +174,147 @@ class VoiceAssistant:
             print("Please make sure Chrome is running with remote debugging enabled")
             print("Run: open -a 'Google Chrome' --args --remote-debugging-port=9222")
             raise e
+
+        # Open tabs are tracked from DevTools events, without switching between them
+        self.tabs = TabRegistry(debugger_address)
+        self.tabs.start()
+
+        # Pages are opened in tabs the driver creates, and used as soon as they report ready
+        self.navigator = Navigator(self.driver, wait=lambda timeout: self.wait(timeout, Navigator.poll_frequency))
         
         # API configuration
         self.api_url = os.getenv('API_URL', 'http://localhost:5002/api')
         self.frontend_url = os.getenv('FRONTEND_URL', 'http://localhost:5003')
         self.swap_api_url = os.getenv('SWAP_API_URL', 'http://localhost:3001')
+
+        # One assistant-owned frontend tab, routed in place; extra tabs it opened are closed
+        self.frontend = FrontendTab(self.navigator, self.tabs, self.frontend_url,
+                                    max_tabs=int(os.getenv('FRONTEND_TAB_LIMIT', '3')))
         print("Initialization complete!")
 
     def get_current_twitter_username(self):
-        """Extract Twitter username from current URL"""
+        """Twitter username of the most recently viewed profile tab"""
         try:
-            # Get all Chrome tabs
-            tabs = self.driver.window_handles
-            
-            # Look for Twitter tab
-            for tab in tabs:
-                self.driver.switch_to.window(tab)
-                current_url = self.driver.current_url
-                
-                # Skip MetaMask and other extension URLs
-                if 'chrome-extension://' in current_url:
-                    continue
-                    
-                print(f"Checking URL: {current_url}")
-                match = re.search(r'(?:twitter\.com|x\.com)/([^/?]+)', current_url, re.I)
-                if match:
-                    username = match.group(1)
-                    print(f"Found username: {username}")
-                    return username
-                    
-            print("No Twitter profile found in any tab")
-            return None
-            
-        except Exception as e:
+            tab = self.tabs.first('twitter')
+        except ConnectionError as e:
             print(f"Error getting Twitter username: {e}")
             return None
+        if tab is None:
+            print("No Twitter profile found in any tab")
+            return None
+        print(f"Found username: {tab.value}")
+        return tab.value
+
+    def mark_action(self):
+        """Record the first visible response to the phrase being handled"""
+        job = self.executor.current_job()
+        phrase = job.phrase if job is not None else self.current_phrase
+        self.first_actions.setdefault(phrase, time.monotonic())
 
-    def speak(self, text):
-        """Speak the given text using system TTS"""
+    def report_first_action(self, phrase):
+        """Print the time from the end of a phrase to the first visible response to it"""
+        ended_at = self.phrase_ends.pop(phrase, None)
+        first_action_at = self.first_actions.pop(phrase, None)
+        if ended_at is not None and first_action_at is not None:
+            mode = "early commit" if self.early_commit else "final transcript"
+            print(f"End of speech to first action: {(first_action_at - ended_at) * 1000:.0f} ms ({mode})")
+
+    def command_done(self, job):
+        """Executor callback after each job"""
+        if job.name in self.command_handlers:
+            self.report_first_action(job.phrase)
+
+    def wait(self, timeout, poll_frequency=0.5):
+        """WebDriverWait for handlers that gives up once the command is cancelled"""
+        return CancellableWait(self.driver, timeout, self.executor, poll_frequency)
+
+    def speak(self, text, priority=NORMAL, key=None):
+        """Queue text to be read aloud and return without waiting for it"""
+        self.mark_action()
         print(f"Assistant: {text}")
-        os.system(f'say "{text}"')
+        self.speech.say(text, priority, key)
 
-    def process_command(self, command):
-        """Process voice commands"""
-        command = command.lower()
-        
-        # Add new condition for buy recommendation
-        if any(phrase in command for phrase in ['should i buy this', 'what do you think about buying', 'is it worth buying']):
-            try:
-                # Wait for agent details to load
-                agent_details = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "agent-details"))
-                )
-                
-                # Extract metrics from the page
-                agent_data = {
-                    'mindshare': float(self.driver.find_element(By.ID, "mindshare-value").text),
-                    'mindshareDeltaPercent': float(self.driver.find_element(By.ID, "mindshare-delta").text.strip('%')),
-                    'marketCap': float(self.driver.find_element(By.ID, "market-cap-value").text.replace('$', '').replace(',', '')),
-                    'marketCapDeltaPercent': float(self.driver.find_element(By.ID, "market-cap-delta").text.strip('%')),
-                    'volume24Hours': float(self.driver.find_element(By.ID, "volume-value").text.replace('$', '').replace(',', '')),
-                    'holdersCount': int(self.driver.find_element(By.ID, "holders-value").text.replace(',', '')),
-                    'holdersCountDeltaPercent': float(self.driver.find_element(By.ID, "holders-delta").text.strip('%')),
-                    'liquidity': float(self.driver.find_element(By.ID, "liquidity-value").text.replace('$', '').replace(',', '')),
-                }
-                
-                # Analyze metrics and get recommendation
-                should_buy, explanation = self.analyze_metrics(agent_data)
-                
-                if should_buy:
-                    self.speak("Yes, " + explanation)
-                else:
-                    self.speak(explanation)
-                    
-            except Exception as e:
-                print(f"Error analyzing metrics: {e}")
-                self.speak("Yes, you should buy this agent as mindshare is growing and market cap is increasing")
-                
-        # Check this agent command
-        if 'check this agent' in command:
-            self.handle_check_agent()
-            
-        # Compare with another agent
-        elif 'compare with' in command:
-            username = command.split('compare with @')[-1].strip()
-            if username:
-                self.handle_compare(username)
+    def on_speech_start(self, started_at):
+        """Speech onset from the segmenter thread: stop talking over the user"""
+        if self.barge_in and self.speech.speaking():
+            self.speech.interrupt()
+
+    def process_command(self, command, phrase=None):
+        """Process voice commands; returns the queued Job, or None if nothing was queued"""
+        intent = self.intent_matcher.match(command)
+        if intent is None:
+            return None
+
+        if intent.name == 'cancel':
+            if self.executor.cancel(reason="cancelled by user"):
+                self.speak("Cancelled", URGENT)
             else:
-                self.speak("Please specify a username to compare with")
-                
-        # Show trends command
-        elif 'show trends' in command:
-            self.handle_show_trends()
+                self.speak("Nothing to cancel", URGENT)
+            return None
+
+        # Commands whose value was not heard ask for it instead of running
+        for slot, value in intent.slots.items():
+            if value is None and slot in self.slot_prompts:
+                self.speak(self.slot_prompts[slot])
+                return None
+
+        # A new command preempts whatever is still running for an earlier phrase
+        return self.executor.submit(intent.name, self.command_handlers[intent.name], intent.slots,
+                                    phrase=phrase, timeout=self.command_timeout)
+
+    def handle_buy_recommendation(self):
+        """Handle the should I buy this command"""
+        try:
+            # Wait for agent details to load; every metric comes back in the same call
+            agent_data = self.wait_for_agent_metrics(10, required=BUY_METRICS)
             
-        # Set price alert command
-        elif 'set price alert' in command:
-            price_match = re.search(r'alert (?:for|at) (\d+(?:\.\d+)?)', command)
-            if price_match:
-                price = float(price_match.group(1))
-                self.handle_set_alert(price)
+            # Analyze metrics and get recommendation
+            should_buy, explanation = self.analyze_metrics(agent_data)
+            
+            if should_buy:
+                self.speak("Yes, " + explanation)
             else:
-                self.speak("Please specify a price for the alert")
+                self.speak(explanation)
                 
-        # Export data command
-        elif 'export data' in command:
-            self.handle_export_data()
-
-        # Show top agents command
-        elif any(phrase in command for phrase in ['show top agents', 'show trending agents', 'show agent rankings']):
-            self.handle_show_top_agents()
-
-        # Search tweets command
-        elif 'search tweets' in command:
-            # Extract everything after "search tweets" or "search tweets for"
-            search_text = command.replace('search tweets for', '').replace('search tweets', '').strip()
-            if search_text:
-                self.handle_search_tweets(search_text)
-            else:
-                self.speak("Please specify what to search for")
+        except Exception as e:
+            print(f"Error analyzing metrics: {e}")
+            self.speak("Sorry, I couldn't read this agent's metrics to give a recommendation")
 
-        # Add new AI analysis command
-        if 'show ai analysis' in command:
-            self.handle_ai_analysis()
+    def wait_for_agent_metrics(self, timeout, required=()):
+        """Metrics of the agent shown in the current tab once all ``required`` ones are shown, one script call per poll"""
+        def shown(driver):
+            values = read_agent_metrics(driver)
+            if values is None or any(values[name] is None for name in required):
+                return None
+            return values
+        return self.wait(timeout, poll_frequency=0.1).until(shown)
 
-        # Add new condition for swap token command
-        if any(phrase in command for phrase in ['swap token', 'swap this token', 'buy token']):
-            try:
-                # Extract amount from command if specified
-                amount_match = re.search(r'(\d+(?:\.\d+)?)\s*sei', command)
-                amount = float(amount_match.group(1)) if amount_match else 1.0
-                
-                # Get current URL for contract address
-                current_url = self.driver.current_url
-                
-                # Call swap API
-                response = requests.post(f"{self.swap_api_url}/swap", json={
-                    "dexScreenerUrl": current_url,
-                    "amountSei": amount
-                })
+    def handle_swap_token(self, amount=None):
+        """Handle the swap token command"""
+        try:
+            # Default to 1 SEI when no amount was spoken
+            amount = amount or 1.0
+            
+            # URL of the DexScreener pair being viewed, for its contract address
+            tab = self.tabs.first('dexscreener')
+            current_url = tab.url if tab else self.driver.current_url
+            
+            # Call swap API
+            response = requests.post(f"{self.swap_api_url}/swap", json={
+                "dexScreenerUrl": current_url,
+                "amountSei": amount
+            })
+            
+            if response.status_code == 200:
+                tx_hash = response.json()['txHash']
+                self.speak(f"Swapping {amount} SEI. Transaction hash: {tx_hash}")
+            else:
+                error_msg = response.json().get('error', 'Unknown error occurred')
+                self.speak(f"Sorry, couldn't execute swap: {error_msg}")
                 
-                if response.status_code == 200:
-                    tx_hash = response.json()['txHash']
-                    self.speak(f"Swapping {amount} SEI. Transaction hash: {tx_hash}")
-                else:
-                    error_msg = response.json().get('error', 'Unknown error occurred')
-                    self.speak(f"Sorry, couldn't execute swap: {error_msg}")
-                    
-            except Exception as e:
-                print(f"Error executing swap: {e}")
-                self.speak("Sorry, I couldn't execute the swap. Please try again.")
+        except Exception as e:
+            print(f"Error executing swap: {e}")
+            self.speak("Sorry, I couldn't execute the swap. Please try again.")
 
     def handle_check_agent(self):
         """Handle the check agent command"""
@@ -212,37 +330,15 @@ class VoiceAssistant:
                 self.speak("Sorry, I cannot connect to the API server. Please make sure it's running.")
                 return
             
-            # Open main page with contract search
-            search_url = f"{self.frontend_url}?contractSearch={contract_address}"
-            print(f"Opening URL: {search_url}")
-            webbrowser.open(search_url)
-            
-            # Wait for page load
-            time.sleep(2)
-            
             try:
-                # Switch to the newly opened tab
-                self.driver.switch_to.window(self.driver.window_handles[-1])
-                
-                # Wait for and click the contract search radio button
-                contract_radio = WebDriverWait(self.driver, 10).until(
-                    EC.element_to_be_clickable((By.ID, "contract-search-radio"))
-                )
-                contract_radio.click()
-                
-                # Wait for and fill the contract input
-                contract_input = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.ID, "contract-search-input"))
-                )
-                contract_input.clear()
-                contract_input.send_keys(contract_address)
-                contract_input.send_keys(Keys.RETURN)
-                
+                # Search through the app's command API; it resolves once the agent has loaded
                 self.speak("Performing search")
+                self.frontend.call('contractSearch', contract_address)
                 return
                 
             except Exception as e:
                 print(f"Error interacting with UI: {e}")
+                self.speak("Sorry, I couldn't find an agent for that contract")
                 return
         
         # If no contract address found, try Twitter username
@@ -255,8 +351,12 @@ class VoiceAssistant:
                 self.speak("Sorry, I cannot connect to the API server. Please make sure it's running.")
                 return
             
-            webbrowser.open(f"{self.frontend_url}?search={username}")
             self.speak(f"Searching for {username}")
+            try:
+                self.frontend.call('search', username)
+            except Exception as e:
+                print(f"Error searching for {username}: {e}")
+                self.speak(f"Sorry, I couldn't find an agent for {username}")
             return
         
         self.speak("Please open either a Twitter profile or a DexScreener contract page, then try again.")
@@ -270,28 +370,20 @@ class VoiceAssistant:
             
         self.speak(f"Comparing {current_username} with {username}")
         
-        # Open frontend with compare mode
-        webbrowser.open(f"{self.frontend_url}?search={current_username}&compare={username}")
-        
-        # Simulate clicking compare button and entering username
         try:
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, "compare-button"))
-            ).click()
-            
-            compare_input = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, "compare-input"))
-            )
-            compare_input.send_keys(username)
-            compare_input.send_keys(Keys.ENTER)
+            # Load the current agent, then have the app fetch and show the second one next to it
+            self.frontend.call('search', current_username)
+            first, second = self.frontend.call('compare', username)['agents']
             
             self.speak(f"Showing comparison between {current_username} and {username}")
+            self.speak(f"{first['agentName']} has mindshare {first['mindshare']:.2f}, "
+                       f"{second['agentName']} has {second['mindshare']:.2f}")
         except Exception as e:
             print(f"Error interacting with UI: {e}")
 
     def handle_show_trends(self):
         """Handle the show trends command"""
-        current_username = self.get_current_twitter_username()
+        current_username = self.take_prewarmed('show_trends') or self.get_current_twitter_username()
         if not current_username:
             self.speak("Please open a Twitter profile first")
             return
@@ -299,28 +391,14 @@ class VoiceAssistant:
         self.speak(f"Showing trends for {current_username}")
         
         try:
-            # First navigate to the page and wait for load
-            webbrowser.open(f"{self.frontend_url}?search={current_username}")
-            time.sleep(2)
-            
-            # Switch to the newly opened tab
-            self.driver.switch_to.window(self.driver.window_handles[-1])
-            
-            # Wait for and click the trends button
-            trends_button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.ID, "show-trends-button"))
-            )
-            trends_button.click()
-            
-            # Wait for trends section to be visible
-            WebDriverWait(self.driver, 10).until(
-                EC.visibility_of_element_located((By.ID, "trends-section"))
-            )
-            
-            # Read out the trends data
-            trends_data = self.driver.find_element(By.ID, "trends-data")
-            if trends_data:
-                self.speak(f"Here are the trends for {current_username}: {trends_data.text}")
+            # Load the agent (raises if it cannot be found) and show its chart
+            self.frontend.call('search', current_username)
+            self.frontend.call('showTrends')
+            
+            # Read out the metric changes shown on the page
+            trends = describe_trends(self.wait_for_agent_metrics(10))
+            if trends:
+                self.speak(f"Here are the trends for {current_username}: {trends}")
         except Exception as e:
             print(f"Error showing trends: {e}")
             self.speak("Sorry, I couldn't display the trends")
@@ -335,27 +413,11 @@ class VoiceAssistant:
         self.speak(f"Setting price alert for ${price}")
         
         try:
-            # Navigate and wait for page load
-            webbrowser.open(f"{self.frontend_url}?search={current_username}")
-            time.sleep(2)
-            
-            # Switch to the correct tab
-            self.driver.switch_to.window(self.driver.window_handles[-1])
-            
-            # Wait for and find alert input
-            alert_input = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, "price-alert-input"))
-            )
+            # Load the agent; raises if it cannot be found, so nothing runs on the previous one
+            self.frontend.call('search', current_username)
             
-            # Clear existing value and set new price
-            alert_input.clear()
-            alert_input.send_keys(str(price))
-            alert_input.send_keys(Keys.ENTER)
-            
-            # Wait for confirmation
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "alert-success"))
-            )
+            # Set the alert; the command resolves once the app has it
+            self.frontend.call('setAlert', price)
             
             self.speak(f"Price alert set for ${price}")
         except Exception as e:
@@ -364,7 +426,7 @@ class VoiceAssistant:
 
     def handle_export_data(self):
         """Handle the export data command"""
-        current_username = self.get_current_twitter_username()
+        current_username = self.take_prewarmed('export_data') or self.get_current_twitter_username()
         if not current_username:
             self.speak("Please open a Twitter profile first")
             return
@@ -372,91 +434,44 @@ class VoiceAssistant:
         self.speak("Exporting data for " + current_username)
         
         try:
-            # Navigate to the page
-            webbrowser.open(f"{self.frontend_url}?search={current_username}")
-            
-            # Wait for page load and switch to the new tab
-            time.sleep(3)  # Increased wait time for page load
-            self.driver.switch_to.window(self.driver.window_handles[-1])
-            
-            # Wait for agent data to load
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "agent-details"))
-            )
+            # Load the agent; raises if it cannot be found, so nothing runs on the previous one
+            self.frontend.call('search', current_username)
             
-            # Find and click export button using JavaScript
-            export_button = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, "export-button"))
-            )
-            self.driver.execute_script("arguments[0].scrollIntoView(true);", export_button)
-            self.driver.execute_script("arguments[0].click();", export_button)
-            
-            # Wait for download to start
-            time.sleep(2)
+            # Export; the command resolves once the CSV download has been started
+            self.frontend.call('export')
             self.speak("Data exported successfully")
         except Exception as e:
             print(f"Error exporting data: {e}")
             self.speak("Sorry, I couldn't export the data")
 
     def get_contract_address_from_url(self):
-        """Extract contract address from DexScreener URL"""
+        """Contract address of the most recently viewed DexScreener pair tab"""
         try:
-            tabs = self.driver.window_handles
-            
-            for tab in tabs:
-                self.driver.switch_to.window(tab)
-                current_url = self.driver.current_url
-                
-                # Skip extension URLs
-                if 'chrome-extension://' in current_url:
-                    continue
-                    
-                print(f"Checking URL: {current_url}")
-                
-                # Match DexScreener URL pattern (supporting multiple chain formats)
-                dex_patterns = [
-                    r'dexscreener\.com/[^/]+/([^/?]+)',  # Standard format
-                    r'dexscreener\.com/bsc/([^/?]+)',    # BSC specific
-                    r'dexscreener\.com/ethereum/([^/?]+)', # Ethereum specific
-                    r'dexscreener\.com/polygon/([^/?]+)',  # Polygon specific
-                    r'dexscreener\.com/arbitrum/([^/?]+)', # Arbitrum specific
-                    r'dexscreener\.com/solana/([^/?]+)'    # Solana specific
-                ]
-                
-                for pattern in dex_patterns:
-                    match = re.search(pattern, current_url, re.I)
-                    if match:
-                        contract_address = match.group(1)
-                        print(f"Found contract address: {contract_address}")
-                        return contract_address
-                    
-            print("No contract address found in any tab")
-            return None
-            
-        except Exception as e:
+            tab = self.tabs.first('dexscreener')
+        except ConnectionError as e:
             print(f"Error getting contract address: {e}")
             return None
+        if tab is None:
+            print("No contract address found in any tab")
+            return None
+        print(f"Found contract address: {tab.value}")
+        return tab.value
 
     def handle_show_top_agents(self):
         """Handle the show top agents command"""
         self.speak("Opening top agents rankings")
         try:
-            # Check API connection
-            try:
-                requests.get(self.api_url, timeout=2)
-            except requests.exceptions.ConnectionError:
-                self.speak("Sorry, I cannot connect to the API server. Please make sure it's running.")
-                return
-            
-            # Open top agents page
-            webbrowser.open(f"{self.frontend_url}/top-agents")
-            time.sleep(2)
-            
-            # Switch to the newly opened tab
-            self.driver.switch_to.window(self.driver.window_handles[-1])
-            
-            # Just wait for page load without trying to read data
-            time.sleep(3)  # Give more time for the page to load
+            # The early commit may already have opened the page
+            if not self.take_prewarmed('show_top_agents'):
+                # Check API connection
+                try:
+                    requests.get(self.api_url, timeout=2)
+                except requests.exceptions.ConnectionError:
+                    self.speak("Sorry, I cannot connect to the API server. Please make sure it's running.")
+                    return
+
+                # Show the top agents page; returns once it has rendered
+                self.frontend.show("/top-agents")
             
         except Exception as e:
             print(f"Error showing top agents: {e}")
@@ -474,30 +489,20 @@ class VoiceAssistant:
         try:
             # Navigate to search page with query parameter using proper URL encoding
             encoded_query = requests.utils.quote(query)
-            search_url = f"{self.frontend_url}/search-tweets?q={encoded_query}"
-            webbrowser.open(search_url)
-            time.sleep(2)
-            
-            # Switch to the newly opened tab
-            self.driver.switch_to.window(self.driver.window_handles[-1])
-            
+            # Returns once the search has loaded: TweetSearch holds the ready marker until then
+            # and clears the previous query's cards, so the count below is never stale
             try:
-                # Wait for results
-                results = WebDriverWait(self.driver, 5).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, '.MuiCard-root'))
-                )
-                tweet_count = len(self.driver.find_elements(By.CSS_SELECTOR, '.MuiCard-root'))
+                self.frontend.show(f"/search-tweets?q={encoded_query}")
+            except TimeoutException:
+                self.speak("Still loading results...", LOW)
+                return
+
+            tweet_count = len(self.driver.find_elements(By.CSS_SELECTOR, '.MuiCard-root'))
+            if tweet_count:
                 self.speak(f"Found {tweet_count} tweets matching your search")
-                
-            except Exception as e:
-                try:
-                    error = WebDriverWait(self.driver, 2).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, '.MuiAlert-root'))
-                    )
-                    self.speak("No tweets found matching your search")
-                except:
-                    self.speak("Still loading results...")
-                
+            else:
+                self.speak("No tweets found matching your search")
+
         except Exception as e:
             print(f"Error searching tweets: {e}")
             self.speak("Sorry, there was an error while searching tweets")
@@ -506,7 +511,7 @@ class VoiceAssistant:
         """Handle the show AI analysis command"""
         try:
             # Find and click AI analysis button
-            ai_button = WebDriverWait(self.driver, 10).until(
+            ai_button = self.wait(10).until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, '[data-testid="show-ai-analysis"]'))
             )
             ai_button.click()
@@ -516,102 +521,206 @@ class VoiceAssistant:
             self.speak("Sorry, I couldn't show the AI analysis")
 
     def analyze_metrics(self, agent_data):
-        """Analyze agent metrics and provide a recommendation"""
+        """Analyze agent metrics and provide a recommendation; never recommends buying on missing metrics"""
+        missing = [BUY_METRICS[name] for name in BUY_METRICS if agent_data.get(name) is None]
+        if missing:
+            return False, "I can't recommend this agent without its " + ", ".join(missing)
+
         analysis = []
         
         # Analyze mindshare
-        if agent_data.get('mindshareDeltaPercent', 0) > 0:
+        if agent_data['mindshareDeltaPercent'] > 0:
             analysis.append("Positive mindshare growth indicates increasing market interest")
         
         # Analyze market metrics
-        if agent_data.get('marketCapDeltaPercent', 0) > -50:  # Allow some decline but not too much
-            if agent_data.get('volume24Hours', 0) > agent_data.get('marketCap', 0) * 0.01:  # Good volume
+        if agent_data['marketCapDeltaPercent'] > -50:  # Allow some decline but not too much
+            if agent_data['volume24Hours'] > agent_data['marketCap'] * 0.01:  # Good volume
                 analysis.append("Healthy trading volume relative to market cap")
         
         # Analyze holders
-        if agent_data.get('holdersCountDeltaPercent', 0) > 0:
+        if agent_data['holdersCountDeltaPercent'] > 0:
             analysis.append("Growing holder base suggests strong community support")
         
         # Analyze liquidity
-        if agent_data.get('liquidity', 0) > agent_data.get('marketCap', 0) * 0.02:  # 2% liquidity ratio
+        if agent_data['liquidity'] > agent_data['marketCap'] * 0.02:  # 2% liquidity ratio
             analysis.append("Good liquidity ratio for trading")
         
         # Generate recommendation
         if len(analysis) >= 3:  # At least 3 positive factors
             return True, "Based on positive mindshare growth, " + " and ".join(analysis[:-1]) + ", and " + analysis[-1]
         else:
-            return False, "Consider waiting as some metrics need improvement: " + ", ".join([
-                "mindshare trend" if agent_data.get('mindshareDeltaPercent', 0) <= 0 else "",
-                "market stability" if agent_data.get('marketCapDeltaPercent', 0) <= -50 else "",
-                "trading volume" if agent_data.get('volume24Hours', 0) <= agent_data.get('marketCap', 0) * 0.01 else "",
-                "holder growth" if agent_data.get('holdersCountDeltaPercent', 0) <= 0 else "",
-                "liquidity" if agent_data.get('liquidity', 0) <= agent_data.get('marketCap', 0) * 0.02 else ""
-            ])
+            return False, "Consider waiting as some metrics need improvement: " + ", ".join(filter(None, [
+                "mindshare trend" if agent_data['mindshareDeltaPercent'] <= 0 else "",
+                "market stability" if agent_data['marketCapDeltaPercent'] <= -50 else "",
+                "trading volume" if agent_data['volume24Hours'] <= agent_data['marketCap'] * 0.01 else "",
+                "holder growth" if agent_data['holdersCountDeltaPercent'] <= 0 else "",
+                "liquidity" if agent_data['liquidity'] <= agent_data['marketCap'] * 0.02 else ""
+            ]))
+
+    def on_partial(self, started_at, text):
+        """Interim transcript from the segmenter thread: queue an early commit when the command is certain"""
+        if not self.early_commit or started_at == self.committed_phrase or not self.intent_matcher.has_wake_word(text):
+            return
+        if self.speech.audible():
+            return  # most likely the assistant hearing itself
+        command = self.intent_matcher.command(text)
+        if command is not None and command.name in self.prewarmers:
+            self.committed_phrase = started_at
+            self.early_commits.put((started_at, command))
+
+    def run_early_commits(self):
+        """Queue the pre-warm jobs of early commits, ahead of their phrase's final command"""
+        while True:
+            try:
+                started_at, command = self.early_commits.get_nowait()
+            except queue.Empty:
+                return
+            print(f"Early commit: {command.name}")
+            self.early_committed[started_at] = command.name
+            self.executor.submit(f"prewarm {command.name}", self.prewarm, {'name': command.name},
+                                 phrase=started_at, timeout=self.command_timeout)
+
+    def run_discards(self):
+        """Undo the early work of phrases the capture thread skipped or dropped"""
+        while True:
+            try:
+                phrase = self.discarded_phrases.get_nowait()
+            except queue.Empty:
+                return
+            self.discard_phrase(phrase)
+
+    def discard_phrase(self, phrase):
+        """Forget a phrase that will never be recognized: cancel its pre-warm and drop what is kept for it"""
+        if self.early_committed.pop(phrase, None) is not None:
+            self.executor.cancel(phrase=phrase, reason="phrase discarded")
+        self.prewarmed = {key: value for key, value in self.prewarmed.items() if key[0] != phrase}
+        self.first_actions.pop(phrase, None)
+        self.phrase_ends.pop(phrase, None)
+
+    def prewarm(self, name):
+        """Executor job: run the pre-warmer of command ``name`` and keep its result for the handler"""
+        phrase = self.executor.current_job().phrase
+        self.prewarmed = {(phrase, name): self.prewarmers[name]()}
+
+    def take_prewarmed(self, name):
+        """Result of the early commit for command ``name`` of this phrase, or None if it was not pre-warmed"""
+        job = self.executor.current_job()
+        return self.prewarmed.pop((job.phrase if job else None, name), None)
+
+    def prewarm_top_agents(self):
+        """Check the API and open the rankings page; True if the page is open"""
+        try:
+            requests.get(self.api_url, timeout=2)
+        except requests.exceptions.ConnectionError:
+            return False
+        self.frontend.show("/top-agents")
+        self.mark_action()
+        return True
+
+    def probe_command(self, audio):
+        """Command in a phrase that is still being spoken, decoded locally"""
+        if not self.speech_backend.can_probe:
+            return None
+        return self.speech_backend.probe_command(prepare_for_recognition(audio, self.recognizer.energy_threshold))
 
     def listen(self):
         """Listen for voice commands"""
-        with sr.Microphone() as source:
-            print("\nListening for commands...")
-            
-            # Adjust for ambient noise more frequently
-            try:
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
-            except Exception as e:
-                print(f"Error adjusting for noise: {e}")
-            
+        # Capture runs on its own thread so speech is never lost while a command executes.
+        # Complete commands end after a short pause; open slots get a longer pause and limit
+        endpointer = SlotAwareEndpointer(self.probe_command)
+        partials = PartialRecognizer(self.speech_backend, self.on_partial, on_phrase_start=self.on_speech_start)
+        # Phrases heard mostly while the assistant was talking are its own voice and never recognized
+        # Discarded phrases are cleaned up on this thread, after any early commit queued for them
+        capture = AudioCapture(self.recognizer, phrase_time_limit=endpointer.phrase_limit, endpointer=endpointer,
+                               phrase_listener=partials, self_speech=self.speech.audible,
+                               on_discard=lambda utterance: self.discarded_phrases.put(utterance.started_at))
+        print("\nListening for commands...")
+        capture.start()
+        reported_drops = 0
+
+        try:
             while True:
+                self.run_early_commits()
+                self.run_discards()
+                try:
+                    audio = capture.utterances.get(timeout=0.05)
+                except queue.Empty:
+                    continue
+                self.run_early_commits()  # a commit from this phrase's last partial must run first
+
+                phrase = self.current_phrase = audio.started_at
+                speech_ended_at = audio.ended_at
+                committed = self.early_committed.get(phrase)
+
+                # Trimmed 16 kHz audio is all the recognizers need, and a fraction of the upload
+                captured_bytes = len(audio.frame_data)
+                audio = prepare_for_recognition(audio, self.recognizer.energy_threshold,
+                                                normalize=self.normalize_gain)
+
+                # Skip the network round trip for speech that doesn't start with the wake word
+                if self.wake_word and not self.wake_word.detect(audio):
+                    print("Ignoring phrase without wake word")
+                    self.discard_phrase(phrase)
+                    continue
+
+                self.early_committed.pop(phrase, None)
+                self.phrase_ends[phrase] = speech_ended_at
+                job = None
                 try:
-                    print("Listening...")
-                    audio = self.recognizer.listen(source, 
-                        timeout=10,  # 10 second timeout
-                        phrase_time_limit=5  # 5 second phrase limit
-                    )
+                    started = time.monotonic()
+                    text, confidence = self.speech_backend.recognize(audio)
+                    print(f"Recognized {len(audio.frame_data)} of {captured_bytes} captured bytes "
+                          f"in {(time.monotonic() - started) * 1000:.0f} ms")
                     
-                    try:
-                        text = self.recognizer.recognize_google(audio, 
-                            show_all=False,  # Only return most likely result
-                            with_confidence=True  # Include confidence scores
-                        )
-                        
-                        if isinstance(text, tuple):
-                            text, confidence = text
-                        
-                        print(f"\nYou said: {text} (Confidence: {confidence:.2f})")
-                        
-                        # Check if command starts with "cookie" (case insensitive)
-                        if 'cookie' in text.lower():
-                            self.process_command(text)
-                        else:
-                            print("Hint: Start with 'cookie' to give commands")
-                            # Rotate through friendly reminders
-                            reminders = [
-                                "Just add 'cookie' before your command and I'll help you out!",
-                                "Start with 'cookie' and I'll be happy to assist.",
-                                "Remember to say 'cookie' first - then I'm all ears!",
-                                "Add 'cookie' to the start and let's try that again.",
-                                "Quick tip: begin with 'cookie' to activate me."
-                            ]
-                            self.speak(random.choice(reminders))
-                            
-                    except sr.UnknownValueError:
-                        print("Could not understand audio")
-                    except sr.RequestError as e:
-                        print(f"Could not request results; {e}")
+                    print(f"\nYou said: {text} (Confidence: {confidence:.2f})")
+                    
+                    # Confirm or drop an early commit against the final transcript
+                    final_intent = self.intent_matcher.match(text)
+                    if committed and (final_intent is None or final_intent.name != committed):
+                        print(f"Early commit {committed} not confirmed by the final transcript")
+                        self.executor.cancel(phrase=phrase)
+                        self.prewarmed.pop((phrase, committed), None)
+
+                    # Check if command starts with "cookie" (case insensitive)
+                    if self.intent_matcher.has_wake_word(text):
+                        # A new command makes whatever is still being said about the last one stale
+                        self.speech.interrupt(drop_below=URGENT)
+                        job = self.process_command(text, phrase)
+                    else:
+                        print("Hint: Start with 'cookie' to give commands")
+                        # Rotate through friendly reminders
+                        self.speak(random.choice(REMINDERS), LOW, key='reminder')
                         
-                except sr.WaitTimeoutError:
-                    continue
-                except KeyboardInterrupt:
-                    print("\nStopping voice assistant...")
-                    break
+                except sr.UnknownValueError:
+                    print("Could not understand audio")
+                except sr.RequestError as e:
+                    print(f"Could not request results; {e}")
                 except Exception as e:
                     print(f"Error: {e}")
-                    continue
-                
-                # Adjust for ambient noise periodically
-                try:
-                    self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
-                except:
-                    pass
+
+                # Queued commands report when they have run; everything else has responded by now
+                if job is None:
+                    self.report_first_action(phrase)
+
+                # Report capture losses as soon as they happen
+                stats = capture.stats()
+                drops = stats['frames_dropped'] + stats['input_overflows'] + stats['utterances_dropped']
+                if drops != reported_drops:
+                    print(f"Audio capture losses: {stats}")
+                    reported_drops = drops
+
+        except KeyboardInterrupt:
+            print("\nStopping voice assistant...")
+        finally:
+            capture.stop()
+            self.executor.stop()
+            self.speech.stop()
+            self.tabs.stop()
+            print(f"Audio capture stats: {capture.stats()}")
+            print(f"Command stats: {self.executor.stats()}")
+            print(f"Speech output stats: {self.speech.counts} {self.speech.backend.stats()}")
+            if self.speech_backend.stats():
+                print(f"Recognition stats: {self.speech_backend.stats()}")
 
 def main():
     try:
@@ -0,0 +1,162 @@
+import time
+from urllib.parse import urlsplit
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+# The frontend sets data-agentx-ready on <html> to "true" once the page has
+# rendered and any search from its URL has finished loading (see App.js)
+APP_READY_SCRIPT = "return document.documentElement.dataset.agentxReady === 'true';"
+DOCUMENT_READY_SCRIPT = "return document.readyState === 'complete';"
+
+
+class Navigator:
+    """Open and navigate tabs through WebDriver, returning as soon as the page is ready
+
+    Instead of ``webbrowser.open`` followed by a fixed sleep and a guess that
+    the newest window handle is the new tab, ``open`` creates the tab with
+    ``switch_to.new_window`` (so its handle is known and focused) and both
+    ``open`` and ``navigate`` wait for ``document.readyState``, plus the
+    frontend's ``data-agentx-ready`` marker when ``app`` is set.
+
+    ``wait(timeout)`` builds the WebDriverWait to poll with, so commands can
+    pass one that stops when they are cancelled.
+    """
+
+    poll_frequency = 0.05
+
+    def __init__(self, driver, wait=None):
+        self.driver = driver
+        self.wait = wait or (lambda timeout: WebDriverWait(driver, timeout, poll_frequency=self.poll_frequency))
+
+    def open(self, url, app=False, timeout=10):
+        """Open ``url`` in a new focused tab and return its window handle once it is ready"""
+        started = time.monotonic()
+        self.driver.switch_to.new_window('tab')
+        handle = self.driver.current_window_handle
+        self._load(url, app, timeout, started)
+        return handle
+
+    def navigate(self, handle, url, app=False, timeout=10):
+        """Load ``url`` in the tab ``handle`` and return once it is ready"""
+        started = time.monotonic()
+        self.driver.switch_to.window(handle)
+        self._load(url, app, timeout, started)
+        return handle
+
+    def wait_ready(self, app=False, timeout=10):
+        """Wait for the current tab to finish loading (and the app to render, with ``app``)"""
+        wait = self.wait(timeout)
+        wait.until(lambda driver: driver.execute_script(DOCUMENT_READY_SCRIPT))
+        if app:
+            wait.until(lambda driver: driver.execute_script(APP_READY_SCRIPT))
+
+    def _load(self, url, app, timeout, started):
+        self.driver.get(url)
+        self.wait_ready(app, timeout)
+        print(f"Loaded {url} in {(time.monotonic() - started) * 1000:.0f} ms")
+
+
+# Route the app in place: push the new URL and let the router (and App.js) react to popstate.
+# Returns false when the tab no longer shows the app, so it has to be loaded instead.
+ROUTE_SCRIPT = """
+const url = new URL(arguments[0], window.location.href);
+if (url.origin !== window.location.origin || !document.documentElement.dataset.agentxReady) return false;
+if (url.pathname + url.search !== window.location.pathname + window.location.search) {
+    window.history.pushState({}, '', url.pathname + url.search);
+    window.dispatchEvent(new PopStateEvent('popstate', {state: {}}));
+}
+return true;
+"""
+
+
+class FrontendTab:
+    """The assistant's one long-lived AgentX frontend tab
+
+    ``show(path)`` routes the tab it already has with ``history.pushState``
+    and a ``popstate`` event, so the React bundle is loaded once instead of
+    per command. A new tab is only opened when there is none, or the user
+    closed or navigated it away from the app; the most recently used
+    frontend tab (one of the user's, or left by an earlier run) is adopted.
+    Tabs this instance opened are closed through DevTools beyond
+    ``max_tabs``, least recently used first; the user's tabs are never
+    closed.
+    """
+
+    def __init__(self, navigator, tabs, frontend_url, max_tabs=3):
+        self.navigator = navigator
+        self.tabs = tabs
+        self.frontend_url = frontend_url.rstrip("/")
+        self.max_tabs = max_tabs
+        self.handle = None
+        self.opened = set()  # handles of the tabs this instance opened
+
+    def frontend_tabs(self):
+        """Open tabs showing the frontend, most recently used first"""
+        return [tab for tab in self.tabs.tabs() if tab.url.startswith(self.frontend_url)]
+
+    def show(self, path, timeout=10):
+        """Show ``path`` of the app in the assistant's tab and return its handle once the page is ready"""
+        url = self.frontend_url + path
+        frontend_tabs = self.frontend_tabs()
+        if all(tab.id != self.handle for tab in frontend_tabs):
+            # Closed, or the user took it elsewhere: adopt the most recent frontend tab, if any
+            self.handle = frontend_tabs[0].id if frontend_tabs else None
+
+        if self.handle is None:
+            self.handle = self.navigator.open(url, app=True, timeout=timeout)
+            self.opened.add(self.handle)
+        else:
+            self.navigator.driver.switch_to.window(self.handle)
+            if self.navigator.driver.execute_script(ROUTE_SCRIPT, url):
+                self.navigator.wait_ready(app=True, timeout=timeout)
+                print(f"Routed to {path}")
+            else:
+                self.navigator.navigate(self.handle, url, app=True, timeout=timeout)
+        self.collect(frontend_tabs)
+        return self.handle
+
+    def call(self, command, *args, path="/", timeout=10):
+        """Run a ``window.agentx`` command in the assistant's tab, first showing ``path`` if the tab is elsewhere"""
+        tab = next((tab for tab in self.frontend_tabs() if tab.id == self.handle), None)
+        if tab is None or urlsplit(tab.url).path != path:
+            self.show(path, timeout)
+        else:
+            self.navigator.driver.switch_to.window(self.handle)
+        return call_app(self.navigator.driver, command, *args, timeout=timeout)
+
+    def collect(self, frontend_tabs=None):
+        """Close the least recently used tabs this instance opened over ``max_tabs``, never the current one"""
+        if frontend_tabs is None:
+            frontend_tabs = self.frontend_tabs()
+        # Forget tabs that were closed or taken away from the app; they are no longer ours to close
+        self.opened &= {tab.id for tab in frontend_tabs} | {self.handle}
+        stale = [tab for tab in frontend_tabs if tab.id in self.opened and tab.id != self.handle]
+        for tab in stale[max(0, self.max_tabs - 1):]:
+            if self.tabs.close(tab.id):
+                self.opened.discard(tab.id)
+                print(f"Closed stale frontend tab {tab.url}")
+
+
+# Runs window.agentx[command](...args) (see App.js) and completes with what its promise resolves to
+BRIDGE_SCRIPT = """
+const [command, args, done] = arguments;
+const api = window.agentx;
+if (!api || typeof api[command] !== 'function') {
+    done({ok: false, error: 'agentx.' + command + ' is not available on this page'});
+    return;
+}
+Promise.resolve().then(() => api[command](...args)).then(done, (e) => done({ok: false, error: String(e)}));
+"""
+
+
+def call_app(driver, command, *args, timeout=10):
+    """Run a ``window.agentx`` command in the current tab and return its result, in one round trip
+
+    The command's promise resolves to a dict with ``ok``; a failed command
+    raises RuntimeError with its ``error``.
+    """
+    driver.set_script_timeout(timeout)
+    result = driver.execute_async_script(BRIDGE_SCRIPT, command, list(args))
+    if not result or not result.get('ok'):
+        raise RuntimeError(f"agentx.{command} failed: {(result or {}).get('error')}")
+    return result
@@ -0,0 +1,58 @@
+import collections
+import math
+
+
+class NoiseFloorEstimator:
+    """Track the background noise level from the live audio energies
+
+    Keeps the energies of the last ``window_seconds`` of audio and follows a
+    low percentile of them with an exponential moving average. Speech only
+    fills the loud end of the window, so the floor keeps tracking the room
+    while the user talks and no separate calibration pause is needed.
+    """
+
+    def __init__(self, seconds_per_buffer, initial_threshold=300, ratio=1.5, window_seconds=5,
+                 percentile=20, time_constant=2.0, min_threshold=50):
+        self.ratio = ratio
+        self.percentile = percentile
+        self.min_threshold = min_threshold
+        self.alpha = 1 - math.exp(-seconds_per_buffer / time_constant)
+        self.energies = collections.deque(maxlen=max(1, int(math.ceil(window_seconds / seconds_per_buffer))))
+        self.floor = initial_threshold / ratio
+
+    @property
+    def threshold(self):
+        """Energy above which a frame counts as speech"""
+        return max(self.min_threshold, self.floor * self.ratio)
+
+    def quiet_level(self):
+        """Energy at ``percentile`` of the current window"""
+        ordered = sorted(self.energies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))]
+
+    def update(self, energy):
+        """Add one frame energy and return the new threshold"""
+        self.energies.append(energy)
+        self.floor += self.alpha * (self.quiet_level() - self.floor)
+        return self.threshold
+
+    def spread(self):
+        """Spread of the quiet half of the window, used as a drift allowance"""
+        if not self.energies:
+            return 0.0
+        ordered = sorted(self.energies)[:max(1, len(self.energies) // 2)]
+        mean = sum(ordered) / len(ordered)
+        return math.sqrt(sum((energy - mean) ** 2 for energy in ordered) / len(ordered))
+
+    def calibrate(self, energies):
+        """Set the floor directly from a run of known-quiet frame energies"""
+        self.energies.extend(energies)
+        if self.energies:
+            self.floor = self.quiet_level()
+        return self.threshold
+
+    def restore(self, floor, energies=()):
+        """Resume from a previously learned floor, keeping any live energies already read"""
+        self.energies.extend(energies)
+        self.floor = floor
+        return self.threshold
@@ -0,0 +1,71 @@
+import json
+import os
+import time
+
+from frame_analysis import analyze_frames
+
+
+def frame_energies(frame_data, sample_width, chunk_size):
+    """RMS energy of each ``chunk_size``-sample chunk of raw audio"""
+    return analyze_frames(frame_data, sample_width, chunk_size).energy.tolist()
+
+
+class NoiseProfileStore:
+    """Learned noise floor per input device, kept in a small JSON file"""
+
+    def __init__(self, path=None, tolerance=0.5):
+        self.path = path or os.getenv('NOISE_PROFILE_PATH', os.path.expanduser('~/.agentx/noise_profile.json'))
+        self.tolerance = tolerance  # allowed relative drift of the live noise level
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def load(self, device_name):
+        """Stored profile for ``device_name``, or None"""
+        return self._read().get(device_name)
+
+    def save(self, device_name, estimator):
+        """Store the estimator's current floor for ``device_name``"""
+        profiles = self._read()
+        profiles[device_name] = {
+            'energy_threshold': estimator.threshold,
+            'noise_floor': estimator.floor,
+            'spread': estimator.spread(),
+            'updated': time.time(),
+        }
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(profiles, f, indent=2)
+
+    def matches(self, profile, energies):
+        """True if the live ``energies`` are still close to the stored noise floor"""
+        if not energies:
+            return False
+        live_level = sorted(energies)[len(energies) // 2]
+        allowed = self.tolerance * profile['noise_floor'] + profile.get('spread', 0)
+        return abs(live_level - profile['noise_floor']) <= allowed
+
+
+def load_or_calibrate(store, device_name, estimator, read_energies, validation_seconds=0.25, calibration_seconds=1):
+    """Start ``estimator`` from the stored profile, or recalibrate if it has drifted
+
+    ``read_energies(seconds)`` returns the chunk energies of the next
+    ``seconds`` of live audio. Only ``validation_seconds`` are read when the
+    stored profile still matches the room.
+    """
+    profile = store.load(device_name)
+    energies = read_energies(validation_seconds)
+    if profile and store.matches(profile, energies):
+        print(f"Using saved noise profile for {device_name}")
+        return estimator.restore(profile['noise_floor'], energies)
+
+    if profile:
+        print(f"Noise level changed for {device_name}, recalibrating...")
+    energies += read_energies(max(0, calibration_seconds - validation_seconds))
+    threshold = estimator.calibrate(energies)
+    store.save(device_name, estimator)
+    return threshold
@@ -0,0 +1,67 @@
+import collections
+
+# One value shown on an agent's page: the key it is returned under, the id of
+# the element showing it (see AgentDetails.js) and how its text is parsed:
+# "text", "number", "integer", "money" ("$1,234.5") or "percent" ("+12.34%")
+Metric = collections.namedtuple('Metric', ['name', 'element_id', 'kind'])
+
+AGENT_METRICS = (
+    Metric('agentName', 'agent-name', 'text'),
+    Metric('mindshare', 'mindshare-value', 'number'),
+    Metric('mindshareDeltaPercent', 'mindshare-delta', 'percent'),
+    Metric('marketCap', 'market-cap-value', 'money'),
+    Metric('marketCapDeltaPercent', 'market-cap-delta', 'percent'),
+    Metric('price', 'price-value', 'money'),
+    Metric('priceDeltaPercent', 'price-delta', 'percent'),
+    Metric('liquidity', 'liquidity-value', 'money'),
+    Metric('volume24Hours', 'volume-value', 'money'),
+    Metric('volume24HoursDeltaPercent', 'volume-delta', 'percent'),
+    Metric('holdersCount', 'holders-value', 'integer'),
+    Metric('holdersCountDeltaPercent', 'holders-delta', 'percent'),
+)
+
+# Reads every metric of every agent panel on the page in the browser, in one call
+EXTRACT_SCRIPT = """
+const [scope, rules] = arguments;
+const parse = (text, kind) => {
+    if (kind === 'text') return text.trim();
+    const value = parseFloat(text.replace(/[$,%+\\s]/g, ''));
+    if (Number.isNaN(value)) return null;
+    return kind === 'integer' ? Math.round(value) : value;
+};
+return Array.from(document.querySelectorAll(scope), (panel) => {
+    const values = {};
+    for (const [name, id, kind] of rules) {
+        const element = panel.querySelector('#' + id);
+        values[name] = element ? parse(element.textContent, kind) : null;
+    }
+    return values;
+});
+"""
+
+
+def read_all_agent_metrics(driver, metrics=AGENT_METRICS, scope=".agent-details"):
+    """Metrics of every agent panel on the page (two in compare mode), in one ``execute_script`` round trip
+
+    Each panel gives a dict of metric name to its parsed value, or None
+    when the element is missing or its text is not a number.
+    """
+    return driver.execute_script(EXTRACT_SCRIPT, scope, [list(metric) for metric in metrics])
+
+
+def read_agent_metrics(driver, metrics=AGENT_METRICS):
+    """Metrics of the first agent panel on the page, or None if no agent is shown"""
+    panels = read_all_agent_metrics(driver, metrics)
+    return panels[0] if panels else None
+
+
+def describe_trends(values):
+    """Spoken summary of an agent's metric changes: "mindshare up 12.3%, holders down 1.5%" """
+    changes = []
+    for name, label in (('mindshareDeltaPercent', "mindshare"), ('marketCapDeltaPercent', "market cap"),
+                        ('priceDeltaPercent', "price"), ('volume24HoursDeltaPercent', "volume"),
+                        ('holdersCountDeltaPercent', "holders")):
+        delta = values.get(name)
+        if delta is not None:
+            changes.append(f"{label} {'up' if delta >= 0 else 'down'} {abs(delta):.1f}%")
+    return ", ".join(changes)
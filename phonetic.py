@@ -0,0 +1,167 @@
+from functools import lru_cache
+import re
+import sys
+
+from commands import COMMANDS, STRICT_COMMANDS, WAKE_WORD, WAKE_WORD_FILLERS, WAKE_WORD_VARIANTS
+
+# Spelling-to-sound rewrites applied before vowels are dropped, Metaphone style ("X" is the sh sound)
+_REWRITES = (
+    ('sch', 'sk'), ('ph', 'f'), ('ck', 'k'), ('sh', 'X'), ('ch', 'X'), ('th', '0'), ('gh', 'g'),
+    ('wh', 'w'), ('qu', 'kw'), ('x', 'ks'), ('q', 'k'), ('z', 's'), ('v', 'f'), ('d', 't'),
+)
+_SOFT_C = re.compile(r"c(?=[eiy])")
+_SOFT_G = re.compile(r"g(?=[eiy])")
+_SILENT_START = re.compile(r"^(?:kn|wr|gn)")
+
+
+@lru_cache(maxsize=4096)
+def phonetic_key(word):
+    """Metaphone-style sound key: "cookie", "cooky" and "kooky" all give "K"
+
+    Consonants are rewritten to one letter per sound, vowels (except a
+    leading one), h, w and y are dropped, repeats are collapsed and a
+    plural "s" is ignored.
+    """
+    word = re.sub(r"[^a-z]", "", word.lower())
+    if not word:
+        return ""
+    word = _SILENT_START.sub(lambda match: match.group(0)[1], word)
+    word = _SOFT_C.sub("s", word)
+    word = _SOFT_G.sub("j", word)
+    for spelling, sound in _REWRITES:
+        word = word.replace(spelling, sound)
+    word = word.replace("c", "k").replace("g", "k")
+
+    key = ["A" if word[0] in "aeiou" else word[0].upper()]
+    for letter in word[1:]:
+        if letter in "aeiouhwy":
+            continue
+        if key[-1] != letter.upper():
+            key.append(letter.upper())
+    if len(key) > 1 and key[-1] == "S" and word.endswith("s"):
+        key.pop()
+    return "".join(key)
+
+
+def bounded_levenshtein(a, b, bound):
+    """Edit distance between ``a`` and ``b``, or ``bound + 1`` as soon as it must exceed ``bound``"""
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > bound:
+            return bound + 1
+        previous = current
+    return previous[-1]
+
+
+def similar(word, target, target_key=None):
+    """True if ``word`` sounds like ``target`` and is spelled within a third of its length of it
+
+    Words of four letters or fewer must match exactly, since nearly any
+    short word is a letter or two from another ("cook", "coke"). Longer
+    words also match on a single-letter typo even when that changes their
+    sound key ("trens" for "trends").
+    """
+    if word == target:
+        return True
+    if len(word) <= 4:
+        return False
+    if phonetic_key(word) != (target_key or phonetic_key(target)):
+        return len(target) >= 5 and bounded_levenshtein(word, target, 1) <= 1
+    bound = max(1, len(target) // 3)
+    return bounded_levenshtein(word, target, bound) <= bound
+
+
+class PhoneticMatcher:
+    """Fuzzy wake-word and command phrase matching over precomputed sound keys
+
+    Phrases are indexed by the key of their first word, so only phrases that
+    can start at a given transcript word are compared, word by word, against
+    their precomputed keys. Commands in ``strict`` are left out entirely.
+    """
+
+    def __init__(self, commands=COMMANDS, wake_word=WAKE_WORD, wake_word_variants=WAKE_WORD_VARIANTS,
+                 strict=STRICT_COMMANDS):
+        self.wake_word = wake_word
+        self.wake_word_key = phonetic_key(wake_word)
+        self.wake_word_variants = set(wake_word_variants)
+        self.by_first_key = {}
+        for command in commands:
+            if command.name in strict:
+                continue
+            for phrase in command.phrases:
+                words = phrase.split()
+                entry = (words, [phonetic_key(word) for word in words], command)
+                self.by_first_key.setdefault(entry[1][0], []).append(entry)
+        for entries in self.by_first_key.values():
+            entries.sort(key=lambda entry: len(entry[0]), reverse=True)  # longest phrase first
+
+    def is_wake_word(self, word):
+        return word in self.wake_word_variants or similar(word, self.wake_word, self.wake_word_key)
+
+    def wake_word_position(self, tokens):
+        """Index of the wake word among the first words of ``tokens`` (after a filler), or None"""
+        for position, token in enumerate(tokens[:2]):
+            if self.is_wake_word(token):
+                return position
+            if token not in WAKE_WORD_FILLERS:
+                return None
+        return None
+
+    def find(self, tokens):
+        """``(command, end)`` of the earliest, longest phrase that sounds like ``tokens[start:end]``"""
+        for start, token in enumerate(tokens):
+            for words, keys, command in self.by_first_key.get(phonetic_key(token), ()):
+                end = start + len(words)
+                if end <= len(tokens) and all(similar(tokens[start + i], words[i], keys[i]) for i in range(len(words))):
+                    return command, end
+        return None
+
+
+def report(path, exact_matcher, fuzzy_matcher):
+    """False-trigger and miss counts over a labelled transcript file, literal against fuzzy matching
+
+    Each line of ``path`` is ``<expected command name or none><TAB><transcript>``.
+    A miss is a command transcript that does not dispatch its command; a
+    false trigger is a transcript that dispatches a command it should not.
+    """
+    totals = {name: {'misses': 0, 'false_triggers': 0} for name in ('literal', 'phonetic')}
+    commands = negatives = 0
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            expected, transcript = line.rstrip("\n").split("\t", 1)
+            expected = None if expected == "none" else expected
+            commands += expected is not None
+            negatives += expected is None
+            for name, matcher in (('literal', exact_matcher), ('phonetic', fuzzy_matcher)):
+                intent = matcher.match(transcript) if matcher.has_wake_word(transcript) else None
+                got = intent.name if intent else None
+                if expected is not None and got != expected:
+                    totals[name]['misses'] += 1
+                if got is not None and got != expected:
+                    totals[name]['false_triggers'] += 1
+    return commands, negatives, totals
+
+
+def main():
+    from intents import IntentMatcher
+
+    if len(sys.argv) < 3 or sys.argv[1] != "report":
+        print("Usage: python phonetic.py report <labelled_transcripts.tsv>")
+        return
+    commands, negatives, totals = report(sys.argv[2], IntentMatcher(fuzzy=False), IntentMatcher())
+    print(f"{commands} command transcripts, {negatives} non-command transcripts")
+    print(f"{'matching':<10} {'miss rate':>10} {'false triggers':>15}")
+    for name, counts in totals.items():
+        print(f"{name:<10} {counts['misses'] / max(commands, 1):>10.1%} "
+              f"{counts['false_triggers'] / max(commands + negatives, 1):>15.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import speech_recognition as sr
+import numpy as np
+
+from audio_capture import Utterance
+from frame_analysis import analyze_frames, pcm_samples
+
+
+def speech_bounds(samples, sample_rate, energy_threshold, frame_seconds=0.01, padding=0.2):
+    """Sample range from the first to the last speech frame, widened by ``padding`` seconds
+
+    Returns None when no frame is above ``energy_threshold``.
+    """
+    frame_size = max(1, int(sample_rate * frame_seconds))
+    analysis = analyze_frames(samples.astype('<i2').tobytes(), 2, frame_size, energy_threshold)
+    speech = np.flatnonzero(analysis.speech)
+    if not len(speech):
+        return None
+    pad = int(padding * sample_rate)
+    start = max(0, speech[0] * frame_size - pad)
+    end = min(len(samples), (speech[-1] + 1) * frame_size + pad)
+    return start, end
+
+
+def resample(samples, source_rate, target_rate):
+    """Band-limited resampling of 16-bit samples through the FFT
+
+    Dropping the spectrum above the target Nyquist frequency is the
+    anti-aliasing filter, so any ratio (44.1 kHz to 16 kHz included) costs
+    one forward and one inverse real FFT.
+    """
+    if source_rate == target_rate or not len(samples):
+        return samples
+    target_length = max(1, int(round(len(samples) * target_rate / source_rate)))
+    spectrum = np.fft.rfft(samples.astype(np.float64))
+    kept = min(len(spectrum), target_length // 2 + 1)
+    resampled = np.fft.irfft(spectrum[:kept], target_length) * (target_length / len(samples))
+    return np.clip(np.round(resampled), -32768, 32767).astype(np.int16)
+
+
+def normalize_gain(samples, target_peak=0.7, max_gain=8.0):
+    """Scale samples so the peak reaches ``target_peak`` of full scale, boosting at most ``max_gain`` times"""
+    peak = int(np.abs(samples.astype(np.int32)).max()) if len(samples) else 0
+    if peak == 0:
+        return samples
+    gain = min(max_gain, target_peak * 32767 / peak)
+    return np.clip(np.round(samples * gain), -32768, 32767).astype(np.int16)
+
+
+def prepare_for_recognition(audio_data, energy_threshold, sample_rate=16000, padding=0.2, normalize=False):
+    """Trim surrounding silence, convert to at most ``sample_rate`` 16-bit mono and optionally normalize gain
+
+    Recognizers need no more than 16 kHz for speech, so a 44.1/48 kHz capture
+    shrinks to a third of its size before any silence is removed. Utterance
+    timestamps are kept, with ``started_at`` moved past the trimmed lead-in.
+    """
+    samples = pcm_samples(audio_data.get_raw_data(convert_width=2), 2)
+    trimmed_seconds = 0.0
+    bounds = speech_bounds(samples, audio_data.sample_rate, energy_threshold, padding=padding)
+    if bounds is not None:
+        start, end = bounds
+        trimmed_seconds = start / audio_data.sample_rate
+        samples = samples[start:end]
+
+    sample_rate = min(sample_rate, audio_data.sample_rate)  # never upsample
+    samples = resample(samples, audio_data.sample_rate, sample_rate)
+    if normalize:
+        samples = normalize_gain(samples)
+
+    frame_data = samples.astype('<i2').tobytes()
+    if isinstance(audio_data, Utterance):
+        return Utterance(frame_data, sample_rate, 2,
+                         audio_data.started_at + trimmed_seconds, audio_data.ended_at, audio_data.self_speech)
+    return sr.AudioData(frame_data, sample_rate, 2)
@@ -0,0 +1,117 @@
+import speech_recognition as sr
+import collections
+import glob
+import json
+import os
+import sys
+
+from commands import WAKE_WORD, WAKE_WORD_FILLERS, WAKE_WORD_VARIANTS
+from intents import IntentMatcher
+
+# One recognition alternative, rescored: ``text`` has the wake word normalized,
+# ``wake_word`` is "exact", "variant" or None and ``rank`` is its position in the n-best list
+Hypothesis = collections.namedtuple('Hypothesis', ['text', 'confidence', 'command', 'wake_word', 'rank'])
+
+# The matcher the assistant dispatches with, so rescoring and the report agree with it
+_intents = IntentMatcher()
+
+
+def normalize_wake_word(text):
+    """Return ``text`` with a misheard leading wake word replaced, and how it was matched"""
+    words = text.lower().split()
+    if words and words[0] in WAKE_WORD_FILLERS:
+        words = words[1:]
+    spoken = " ".join(words)
+    if spoken == WAKE_WORD or spoken.startswith(WAKE_WORD + " "):
+        return spoken, "exact"
+    for variant in WAKE_WORD_VARIANTS:
+        if spoken == variant or spoken.startswith(variant + " "):
+            return WAKE_WORD + spoken[len(variant):], "variant"
+    return text, None
+
+
+def rescore(alternatives):
+    """Rank ``(transcript, confidence)`` alternatives, best first
+
+    A hypothesis that names a known command beats one that doesn't, then a
+    recognized wake word beats a missing one (an exact one beats a variant),
+    then the recognizer's own order decides.
+    """
+    hypotheses = []
+    for rank, (transcript, confidence) in enumerate(alternatives):
+        text, wake_word = normalize_wake_word(transcript)
+        hypotheses.append(Hypothesis(text, confidence, _intents.command(text), wake_word, rank))
+    return sorted(hypotheses, key=lambda h: (h.command is None, h.wake_word is None, h.wake_word != "exact", h.rank))
+
+
+def best_hypothesis(alternatives):
+    """The hypothesis to dispatch from an n-best list"""
+    return rescore(alternatives)[0]
+
+
+def dispatched_command(text):
+    """Command the assistant would run for ``text`` without reranking"""
+    return _intents.command(text) if _intents.has_wake_word(text) else None
+
+
+def collect(google, corpus_dir, output_path):
+    """Record the n-best lists of a labelled WAV corpus into a JSON lines file
+
+    ``corpus_dir`` has one folder per expected command name (``none`` for
+    phrases that should not trigger anything) holding WAV recordings.
+    """
+    from wake_word import load_wav
+
+    with open(output_path, "w") as f:
+        for path in sorted(glob.glob(os.path.join(corpus_dir, "*", "*.wav"))):
+            expected = os.path.basename(os.path.dirname(path))
+            try:
+                result = google.request(load_wav(path))
+            except sr.RequestError as e:
+                print(f"{path}: {e}")
+                continue
+            alternatives = [[alternative["transcript"], alternative.get("confidence")]
+                            for alternative in result.get("alternative", []) if "transcript" in alternative]
+            f.write(json.dumps({'path': path, 'expected': expected, 'alternatives': alternatives}) + "\n")
+            print(f"{path}: {len(alternatives)} alternatives")
+
+
+def report(results_path):
+    """Command accuracy of the top hypothesis against the reranked one over collected results"""
+    totals = {'utterances': 0, 'top_correct': 0, 'reranked_correct': 0}
+    with open(results_path) as f:
+        for line in f:
+            entry = json.loads(line)
+            alternatives = entry['alternatives']
+            expected = None if entry['expected'] == "none" else entry['expected']
+            top = dispatched_command(alternatives[0][0]) if alternatives else None
+            best = best_hypothesis(alternatives) if alternatives else None
+            reranked = dispatched_command(best.text) if best else None
+            totals['utterances'] += 1
+            totals['top_correct'] += (top.name if top else None) == expected
+            totals['reranked_correct'] += (reranked.name if reranked else None) == expected
+    return totals
+
+
+def main():
+    usage = "Usage: python reranking.py collect <corpus_dir> <results.jsonl> | report <results.jsonl>"
+    if len(sys.argv) < 3:
+        print(usage)
+        return
+
+    if sys.argv[1] == "collect" and len(sys.argv) > 3:
+        from recognizers import GoogleBackend
+        collect(GoogleBackend(sr.Recognizer()), sys.argv[2], sys.argv[3])
+    elif sys.argv[1] == "report":
+        totals = report(sys.argv[2])
+        count = max(totals['utterances'], 1)
+        print(f"Utterances:           {totals['utterances']}")
+        print(f"Top hypothesis:       {totals['top_correct']} correct ({totals['top_correct'] / count:.1%})")
+        print(f"Reranked n-best:      {totals['reranked_correct']} correct ({totals['reranked_correct'] / count:.1%})")
+        print(f"Retries avoided:      {totals['reranked_correct'] - totals['top_correct']}")
+    else:
+        print(usage)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import heapq
+import itertools
+import threading
+import time
+
+from tts_backends import create_tts_backend
+
+URGENT = 0
+NORMAL = 1
+LOW = 2
+
+
+class Message:
+    """Queued text to read aloud"""
+
+    def __init__(self, text, priority, key):
+        self.text = text
+        self.priority = priority
+        self.key = key  # messages with the same key replace each other while queued
+        self.dropped = False
+
+
+class SpeechOutput:
+    """Read messages aloud on a worker thread so callers never wait for speech
+
+    Messages play in priority order (``URGENT`` before ``NORMAL`` before
+    ``LOW``), first come first served within a priority. A message that is
+    already queued with the same text, or the same ``key``, is replaced by
+    the new one instead of being read twice. Barge-in: a more urgent message,
+    ``say(..., interrupt=True)`` or ``interrupt()`` (for example when the user
+    starts talking) stops the message being read.
+
+    Messages are read by a ``tts_backends.TTSBackend``, by default the one
+    ``create_tts_backend`` picks.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or create_tts_backend()
+        self._queue = []
+        self._order = itertools.count()
+        self._ready = threading.Condition()
+        self._current = None
+        self._finished_at = 0.0
+        self._running = True
+        self.counts = {'spoken': 0, 'interrupted': 0, 'coalesced': 0}
+        self._thread = threading.Thread(target=self._run, name="speech-output", daemon=True)
+        self._thread.start()
+
+    def say(self, text, priority=NORMAL, key=None, interrupt=False):
+        """Queue ``text`` and return immediately"""
+        with self._ready:
+            if self._current is not None and self._current.text == text and not interrupt:
+                self.counts['coalesced'] += 1
+                return
+            for _, _, queued in self._queue:
+                if not queued.dropped and (queued.text == text or (key is not None and queued.key == key)):
+                    queued.dropped = True
+                    self.counts['coalesced'] += 1
+            message = Message(text, priority, key)
+            heapq.heappush(self._queue, (priority, next(self._order), message))
+            if interrupt or (self._current is not None and priority < self._current.priority):
+                self._stop_current()
+            self._ready.notify()
+
+    def interrupt(self, drop_below=None):
+        """Stop the message being read; also drop queued messages less urgent than ``drop_below``"""
+        with self._ready:
+            if drop_below is not None:
+                for priority, _, queued in self._queue:
+                    if priority > drop_below:
+                        queued.dropped = True
+            self._stop_current()
+
+    def queue_depth(self):
+        with self._ready:
+            return sum(not message.dropped for _, _, message in self._queue)
+
+    def speaking(self):
+        """True while a message is being read aloud"""
+        return self._current is not None
+
+    def audible(self, tail=0.3):
+        """True while speaking and for ``tail`` seconds after, while the room still echoes it"""
+        return self._current is not None or time.monotonic() - self._finished_at < tail
+
+    def stop(self):
+        with self._ready:
+            self._running = False
+            self._stop_current()
+            self._ready.notify()
+        self._thread.join(timeout=2)
+        self.backend.close()
+
+    def _stop_current(self):
+        if self._current is not None:
+            self.backend.stop()
+            self.counts['interrupted'] += 1
+
+    def _next(self):
+        """Wait for the most urgent queued message and start reading it"""
+        with self._ready:
+            while self._running:
+                while self._queue:
+                    _, _, message = heapq.heappop(self._queue)
+                    if message.dropped:
+                        continue
+                    try:
+                        self.backend.speak(message.text)
+                    except OSError as e:
+                        print(f"Speech output unavailable ({e}), printing only")
+                        continue
+                    self._current = message
+                    return message
+                self._ready.wait()
+            return None
+
+    def _run(self):
+        while self._next() is not None:
+            completed = self.backend.wait()
+            with self._ready:
+                self.counts['spoken'] += completed
+                self._current = None
+                self._finished_at = time.monotonic()
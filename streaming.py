@@ -0,0 +1,41 @@
+class PartialRecognizer:
+    """Phrase listener that decodes a phrase while it is still being spoken
+
+    The segmenter hands it every chunk of the current phrase. Each chunk goes
+    to the backend's streaming decoder, and ``on_partial(started_at, text)``
+    is called whenever the interim transcript changes. ``started_at`` is the
+    phrase start, the same value the finished ``Utterance`` will carry, so
+    partial results can be matched with the final one. Backends without a
+    streaming decoder make this a no-op. ``on_phrase_start(started_at)``, if
+    given, is called at speech onset whatever the backend.
+    """
+
+    def __init__(self, backend, on_partial, on_phrase_start=None):
+        self.backend = backend
+        self.on_partial = on_partial
+        self.on_phrase_start = on_phrase_start
+        self.stream = None
+        self.started_at = None
+        self.text = ""
+
+    def phrase_started(self, started_at, sample_rate, frames):
+        """Speech onset: start a decoder and feed it the retained lead-in audio"""
+        if self.on_phrase_start is not None:
+            self.on_phrase_start(started_at)
+        self.stream = self.backend.start_stream(sample_rate)
+        self.started_at = started_at
+        self.text = ""
+        for buffer in frames:
+            self.phrase_audio(buffer)
+
+    def phrase_audio(self, buffer):
+        """Decode one chunk of the current phrase"""
+        if self.stream is None:
+            return
+        text = self.stream.accept(buffer)
+        if text and text != self.text:
+            self.text = text
+            self.on_partial(self.started_at, text)
+
+    def phrase_ended(self):
+        self.stream = None
@@ -2,6 +2,9 @@ import speech_recognition as sr
 import os
 import sys
 
+from noise_floor import NoiseFloorEstimator
+from noise_profile import NoiseProfileStore, frame_energies, load_or_calibrate
+
 def check_mic_permissions():
     print("Checking microphone permissions...")
     try:
@@ -32,8 +35,18 @@ def test_microphone():
     
     print("\nTesting MacBook Air Microphone...")
     with sr.Microphone(device_index=0) as source:  # Use MacBook Air Microphone
-        print("Adjusting for ambient noise... Please be quiet.")
-        recognizer.adjust_for_ambient_noise(source, duration=3)
+        # Reuse the saved noise profile unless the room got noisier or quieter
+        print("Checking ambient noise... Please be quiet.")
+        device_name = sr.Microphone.list_microphone_names()[0]
+        estimator = NoiseFloorEstimator(source.CHUNK / source.SAMPLE_RATE, ratio=recognizer.dynamic_energy_ratio)
+
+        def read_energies(seconds):
+            audio = recognizer.record(source, duration=seconds)
+            return frame_energies(audio.frame_data, source.SAMPLE_WIDTH, source.CHUNK)
+
+        recognizer.energy_threshold = load_or_calibrate(
+            NoiseProfileStore(), device_name, estimator, read_energies, calibration_seconds=3
+        )
         print(f"Energy threshold set to {recognizer.energy_threshold}")
         print("\nOK - Now say something! (You have 10 seconds)")
         
@@ -0,0 +1,242 @@
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+
+def _run(command):
+    """True if ``command`` ran and exited cleanly"""
+    try:
+        return subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                              timeout=30).returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+
+
+class TTSBackend:
+    """Text-to-speech engine used by ``speech_output.SpeechOutput``
+
+    ``speak`` starts reading one message and returns, ``wait`` blocks until
+    it is over and returns True if it was read to the end, and ``stop`` cuts
+    it short from another thread. ``speak`` raises ``OSError`` when the
+    engine cannot be started. Engines that can synthesize to a file set
+    ``can_render`` and implement ``render``.
+    """
+
+    name = None
+    can_render = False
+
+    def speak(self, text):
+        raise NotImplementedError
+
+    def render(self, text, path):
+        """Write ``text`` as a WAV file at ``path``; True on success"""
+        return False
+
+    def wait(self):
+        return True
+
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
+
+    def stats(self):
+        return {}
+
+
+class SpawnBackend(TTSBackend):
+    """Start a new TTS process per message (``say`` on macOS)
+
+    The text is passed as an argument, never through a shell, so quotes in
+    it are read rather than breaking the command. ``render_command``, with
+    ``{path}`` in place of the output file, synthesizes to a WAV file.
+    """
+
+    def __init__(self, command=("say",), render_command=None):
+        self.command = list(command)
+        self.render_command = render_command
+        self.can_render = render_command is not None
+        self.name = os.path.basename(self.command[0])
+        self.process = None
+
+    def speak(self, text):
+        self.process = subprocess.Popen(self.command + [text], stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.DEVNULL)
+
+    def render(self, text, path):
+        if not self.can_render:
+            return False
+        return _run([part.format(path=path) for part in self.render_command] + [text])
+
+    def wait(self):
+        return self.process.wait() == 0
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+
+
+class EspeakBackend(TTSBackend):
+    """One long-lived ``espeak`` process reading messages from a pipe
+
+    Without text arguments espeak reads standard input line by line and
+    speaks each line as it arrives, so a message costs one pipe write
+    instead of a process start. espeak reports nothing when a line has been
+    read, so ``wait`` uses its duration at the configured speaking rate.
+    ``stop`` has to kill the process; the next message starts a new one.
+    """
+
+    name = "espeak"
+    can_render = True
+
+    def __init__(self, command=None, words_per_minute=175, sentence_pause=0.3):
+        if command is None:
+            executable = shutil.which("espeak-ng") or shutil.which("espeak")
+            if executable is None:
+                raise OSError("espeak is not installed")
+            command = (executable,)
+        self.command = list(command) + ["-s", str(words_per_minute)]
+        self.words_per_minute = words_per_minute
+        self.sentence_pause = sentence_pause
+        self.process = None
+        self._stopped = threading.Event()
+        self._ends_at = 0.0
+
+    def duration(self, text):
+        """Seconds espeak takes to read ``text``"""
+        words = len(text.split())
+        sentences = max(1, len(re.findall(r"[.!?]+", text)))
+        return words * 60 / self.words_per_minute + sentences * self.sentence_pause
+
+    def render(self, text, path):
+        return _run(self.command + ["-w", path, text])
+
+    def start(self):
+        """Start the engine if it is not running"""
+        if self.process is None or self.process.poll() is not None:
+            self.process = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                            stderr=subprocess.DEVNULL, text=True, bufsize=1)
+
+    def speak(self, text):
+        self.start()
+        self._stopped.clear()
+        self.process.stdin.write(" ".join(text.split()) + "\n")
+        self.process.stdin.flush()
+        self._ends_at = time.monotonic() + self.duration(text)
+
+    def wait(self):
+        return not self._stopped.wait(max(0.0, self._ends_at - time.monotonic()))
+
+    def stop(self):
+        self._stopped.set()
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+
+    def close(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.terminate()
+
+
+class Pyttsx3Backend(TTSBackend):
+    """In-process engine through the optional ``pyttsx3`` package
+
+    The engine is created on the first message, on the thread that speaks,
+    since some platform drivers only run on the thread that made them.
+    """
+
+    name = "pyttsx3"
+
+    def __init__(self, rate=None):
+        import pyttsx3  # optional dependency, only needed for this backend
+        self.pyttsx3 = pyttsx3
+        self.rate = rate
+        self.engine = None
+        self.completed = False
+
+    def speak(self, text):
+        if self.engine is None:
+            try:
+                self.engine = self.pyttsx3.init()
+            except RuntimeError as e:
+                raise OSError(f"pyttsx3 could not start: {e}")
+            if self.rate:
+                self.engine.setProperty('rate', self.rate)
+            self.engine.connect('finished-utterance', self._finished)
+        self.completed = False
+        self.engine.say(text)
+
+    def _finished(self, name, completed):
+        self.completed = completed
+
+    def wait(self):
+        self.engine.runAndWait()
+        return self.completed
+
+    def stop(self):
+        if self.engine is not None:
+            self.engine.stop()
+
+
+class NullBackend(TTSBackend):
+    """Speak nothing; keeps the messages for inspection (headless machines and tests)"""
+
+    name = "null"
+
+    def __init__(self):
+        self.spoken = []
+
+    def speak(self, text):
+        self.spoken.append(text)
+
+
+class FileBackend(TTSBackend):
+    """Append each message with a timestamp to a text file instead of speaking it"""
+
+    name = "file"
+
+    def __init__(self, path):
+        self.path = path
+
+    def speak(self, text):
+        with open(self.path, "a") as f:
+            f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')}\t{text}\n")
+
+
+def create_tts_backend(name=None):
+    """Build the configured TTS backend (env ``TTS_BACKEND``), falling back to no speech
+
+    The default is ``say`` on macOS, the persistent ``espeak`` engine where
+    it is installed and ``null`` otherwise.
+    """
+    if name is None:
+        name = os.getenv('TTS_BACKEND')
+    if name is None:
+        if sys.platform == "darwin":
+            name = "say"
+        elif shutil.which("espeak-ng") or shutil.which("espeak"):
+            name = "espeak"
+        else:
+            name = "null"
+    try:
+        if name == "say":
+            return SpawnBackend(("say",), render_command=("say", "-o", "{path}", "--data-format=LEI16@22050"))
+        if name == "espeak":
+            return EspeakBackend()
+        if name == "pyttsx3":
+            return Pyttsx3Backend()
+        if name == "file":
+            return FileBackend(os.getenv('TTS_FILE', 'speech.log'))
+        if name == "null":
+            return NullBackend()
+    except (ImportError, OSError) as e:
+        print(f"TTS backend '{name}' unavailable: {e}")
+        return NullBackend()
+    print(f"Unknown TTS backend '{name}', speech will only be printed")
+    return NullBackend()
@@ -0,0 +1,181 @@
+import collections
+import hashlib
+import os
+import queue
+import threading
+import wave
+
+from tts_backends import TTSBackend
+
+
+class CachedBackend(TTSBackend):
+    """Play repeated messages from pre-rendered WAV clips instead of synthesizing them again
+
+    Clips are stored in ``cache_dir`` under a hash of the live engine's
+    settings and the text, so changing either just misses the cache. A
+    message is rendered by the live backend on a background thread once it
+    has been spoken ``min_uses`` times, or at startup when it is listed in
+    ``phrases``; until its clip exists, and for templated messages whose
+    values change, the live backend speaks. The least recently played clips
+    are deleted to keep the cache under ``max_bytes``.
+    """
+
+    chunk_frames = 1024
+
+    def __init__(self, live, cache_dir="tts_cache", max_bytes=20 * 1024 * 1024, min_uses=2, phrases=()):
+        import pyaudio  # clips are played directly, so caching needs PyAudio
+        self.pyaudio = pyaudio
+        self.audio = None
+        self.live = live
+        self.name = f"{live.name} + cache"
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.min_uses = min_uses
+        self.voice = repr(getattr(live, 'command', live.name))
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.lock = threading.Lock()
+        self.clips = collections.OrderedDict()  # key -> clip size, least recently played first
+        paths = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir)
+                 if name.endswith(".wav") and not name.endswith(".part.wav")]
+        for path in sorted(paths, key=os.path.getmtime):
+            self.clips[os.path.basename(path)[:-4]] = os.path.getsize(path)
+        self.size = sum(self.clips.values())
+        self.uses = collections.Counter()
+        self.unrenderable = set()
+        self.counts = {'hits': 0, 'misses': 0, 'rendered': 0, 'evicted': 0}
+
+        self._clip = None
+        self._stopped = threading.Event()
+        self.renders = queue.Queue()
+        self._renderer = threading.Thread(target=self._render_loop, name="tts-cache", daemon=True)
+        self._renderer.start()
+        for text in phrases:
+            self.renders.put(text)
+
+    def key(self, text):
+        return hashlib.sha256(f"{self.voice}\n{text}".encode()).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key + ".wav")
+
+    def speak(self, text):
+        key = self.key(text)
+        self._stopped.clear()
+        self._clip = self._load(key)
+        if self._clip is not None:
+            self.counts['hits'] += 1
+            return
+        self.counts['misses'] += 1
+        self.live.speak(text)
+        self.uses[key] += 1
+        if self.uses[key] == self.min_uses:
+            self.renders.put(text)
+
+    def wait(self):
+        if self._clip is None:
+            return self.live.wait()
+        params, frames = self._clip
+        if self.audio is None:
+            self.audio = self.pyaudio.PyAudio()
+        stream = self.audio.open(format=self.audio.get_format_from_width(params.sampwidth),
+                                 channels=params.nchannels, rate=params.framerate, output=True)
+        step = self.chunk_frames * params.sampwidth * params.nchannels
+        try:
+            for start in range(0, len(frames), step):
+                if self._stopped.is_set():
+                    return False
+                stream.write(frames[start:start + step])
+        finally:
+            stream.stop_stream()
+            stream.close()
+        return not self._stopped.is_set()
+
+    def stop(self):
+        self._stopped.set()
+        self.live.stop()
+
+    def close(self):
+        self.renders.put(None)
+        self._renderer.join(timeout=2)
+        self.live.close()
+        if self.audio is not None:
+            self.audio.terminate()
+
+    def stats(self):
+        with self.lock:
+            return {**self.counts, 'clips': len(self.clips), 'bytes': self.size}
+
+    def _load(self, key):
+        """``(wave params, frames)`` of a cached clip, marking it most recently played, or None"""
+        with self.lock:
+            if key not in self.clips:
+                return None
+            self.clips.move_to_end(key)
+        try:
+            os.utime(self.path(key))  # keeps the play order across restarts
+            with wave.open(self.path(key), "rb") as clip:
+                return clip.getparams(), clip.readframes(clip.getnframes())
+        except (OSError, EOFError, wave.Error):
+            self._remove(key)
+            return None
+
+    def _remove(self, key):
+        with self.lock:
+            size = self.clips.pop(key, None)
+            if size is None:
+                return
+            self.size -= size
+        try:
+            os.remove(self.path(key))
+        except OSError:
+            pass
+
+    def _render_loop(self):
+        while True:
+            text = self.renders.get()
+            if text is None:
+                return
+            key = self.key(text)
+            if key in self.clips or key in self.unrenderable:
+                continue
+            path = self.path(key)
+            partial = self.path(key + ".part")
+            if not self.live.render(text, partial):
+                self.unrenderable.add(key)
+                if os.path.exists(partial):
+                    os.remove(partial)
+                continue
+            os.replace(partial, path)
+            with self.lock:
+                self.clips[key] = os.path.getsize(path)
+                self.size += self.clips[key]
+                self.counts['rendered'] += 1
+                evict = []
+                while self.size > self.max_bytes and len(self.clips) > 1:
+                    old, size = self.clips.popitem(last=False)
+                    self.size -= size
+                    evict.append(old)
+                self.counts['evicted'] += len(evict)
+            for old in evict:
+                try:
+                    os.remove(self.path(old))
+                except OSError:
+                    pass
+
+
+def create_cached_backend(live, phrases=()):
+    """Wrap ``live`` in a clip cache (env ``TTS_CACHE_DIR``, ``TTS_CACHE_MB``), or return it as is
+
+    The cache is skipped with ``TTS_CACHE=false``, when PyAudio is missing
+    and for engines that cannot render to a file.
+    """
+    if os.getenv('TTS_CACHE', 'true').lower() != 'true' or not live.can_render:
+        return live
+    try:
+        return CachedBackend(live, cache_dir=os.getenv('TTS_CACHE_DIR', 'tts_cache'),
+                             max_bytes=int(float(os.getenv('TTS_CACHE_MB', '20')) * 1024 * 1024),
+                             phrases=phrases)
+    except ImportError:
+        print("PyAudio not available, speech will not be cached")
+        return live
@@ -0,0 +1,235 @@
+import speech_recognition as sr
+import numpy as np
+from functools import lru_cache
+import glob
+import os
+import sys
+
+from commands import WAKE_WORD
+
+
+@lru_cache(maxsize=8)
+def _mel_filterbank(num_filters, fft_size, sample_rate, high_hz):
+    """Triangular mel filters as a (num_filters, fft_size // 2 + 1) matrix"""
+    def hz_to_mel(hz):
+        return 2595 * np.log10(1 + hz / 700.0)
+
+    def mel_to_hz(mel):
+        return 700 * (10 ** (mel / 2595.0) - 1)
+
+    mel_points = np.linspace(hz_to_mel(0), hz_to_mel(high_hz), num_filters + 2)
+    bins = np.floor((fft_size + 1) * mel_to_hz(mel_points) / sample_rate).astype(int)
+    filters = np.zeros((num_filters, fft_size // 2 + 1))
+    for m in range(1, num_filters + 1):
+        left, center, right = bins[m - 1], bins[m], bins[m + 1]
+        if center > left:
+            filters[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            filters[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+    return filters
+
+
+@lru_cache(maxsize=4)
+def _dct_matrix(num_filters, num_coefficients):
+    """DCT-II basis used to turn log mel energies into cepstra"""
+    n = np.arange(num_filters)
+    k = np.arange(num_coefficients)[:, None]
+    return np.cos(np.pi * k * (2 * n + 1) / (2 * num_filters))
+
+
+def pcm_features(samples, sample_rate, num_filters=26, num_coefficients=13):
+    """Return (MFCC frames, frame log energies) for 16-bit PCM samples
+
+    Frames are 25 ms long with a 10 ms hop; the first cepstral coefficient is
+    dropped so the features do not depend on loudness.
+    """
+    samples = np.asarray(samples, dtype=np.float64)
+    samples = np.append(samples[0], samples[1:] - 0.97 * samples[:-1]) if len(samples) else samples
+    frame_length = int(0.025 * sample_rate)
+    hop = int(0.010 * sample_rate)
+    if len(samples) < frame_length:
+        samples = np.pad(samples, (0, frame_length - len(samples)))
+    count = 1 + (len(samples) - frame_length) // hop
+    index = np.arange(frame_length)[None, :] + hop * np.arange(count)[:, None]
+    frames = samples[index] * np.hamming(frame_length)
+
+    fft_size = 1 << (frame_length - 1).bit_length()
+    power = np.abs(np.fft.rfft(frames, fft_size)) ** 2 / fft_size
+    filters = _mel_filterbank(num_filters, fft_size, sample_rate, min(sample_rate / 2, 8000))
+    log_mel = np.log(np.maximum(power @ filters.T, 1e-10))
+    cepstra = log_mel @ _dct_matrix(num_filters, num_coefficients).T
+    log_energy = np.log(np.maximum(power.sum(axis=1), 1e-10))
+    return cepstra[:, 1:], log_energy
+
+
+def _speech_region(log_energy, floor_db=20):
+    """Slice of frames whose energy is within ``floor_db`` of the loudest frame"""
+    active = np.flatnonzero(log_energy > log_energy.max() - floor_db * np.log(10) / 10)
+    return slice(active[0], active[-1] + 1)
+
+
+def _dtw_score(segment, template, start_slack):
+    """Best average frame distance of ``template`` aligned to the start of ``segment``
+
+    Rows advance one segment frame at a time and the template may stay, move
+    one frame or skip one frame, so each row only depends on the previous one
+    and the recursion is vectorized over template frames. The match may begin
+    anywhere in the first ``start_slack`` segment frames and end anywhere.
+    """
+    cost = np.sqrt(((segment[:, None, :] - template[None, :, :]) ** 2).sum(axis=2))
+    width = template.shape[0]
+    total = np.full(width, np.inf)
+    length = np.zeros(width)
+    best = np.inf
+    for i in range(segment.shape[0]):
+        stay = total
+        step = np.concatenate(([np.inf], total[:-1]))
+        skip = np.concatenate(([np.inf, np.inf], total[:-2]))
+        candidates = np.stack((stay, step, skip))
+        lengths = np.stack((length, np.concatenate(([0], length[:-1])), np.concatenate(([0, 0], length[:-2]))))
+        choice = candidates.argmin(axis=0)
+        columns = np.arange(width)
+        total = cost[i] + candidates[choice, columns]
+        length = lengths[choice, columns] + 1
+        if i < start_slack and cost[i, 0] < total[0]:
+            total[0] = cost[i, 0]
+            length[0] = 1
+        if np.isfinite(total[-1]):
+            best = min(best, total[-1] / length[-1])
+    return best
+
+
+class WakeWordSpotter:
+    """Local template-matching spotter for the wake word
+
+    Compares the head of each captured segment against enrolled recordings of
+    the wake word with MFCC features and dynamic time warping, so speech that
+    does not start with the wake word never reaches the cloud recognizer.
+    ``sensitivity`` ranges from 0 (strict) to 1 (lenient).
+    """
+
+    def __init__(self, templates, sensitivity=0.5, head_seconds=1.5, start_slack_seconds=0.3):
+        if len(templates) < 2:
+            raise ValueError("Need at least two wake word recordings to calibrate the spotter")
+        self.templates = templates
+        self.sensitivity = sensitivity
+        self.head_seconds = head_seconds
+        self.start_slack = int(start_slack_seconds / 0.010)
+
+        # Typical distance between two genuine utterances of the wake word
+        distances = [
+            _dtw_score(a, b, self.start_slack)
+            for i, a in enumerate(templates) for j, b in enumerate(templates) if i != j
+        ]
+        self.reference_distance = float(np.median(distances))
+
+    @classmethod
+    def from_directory(cls, directory, sensitivity=0.5):
+        """Build a spotter from the WAV recordings in ``directory``, or None if there are none"""
+        paths = sorted(glob.glob(os.path.join(directory, "*.wav")))
+        if not paths:
+            return None
+        templates = []
+        for path in paths:
+            features, log_energy = audio_features(load_wav(path))
+            templates.append(features[_speech_region(log_energy)])
+        return cls(templates, sensitivity=sensitivity)
+
+    def threshold(self, sensitivity=None):
+        """Largest distance still accepted as the wake word"""
+        if sensitivity is None:
+            sensitivity = self.sensitivity
+        return self.reference_distance * (0.75 + sensitivity)
+
+    def score(self, audio_data):
+        """Distance between the start of ``audio_data`` and the closest template"""
+        head = audio_data.get_segment(end_ms=int(self.head_seconds * 1000))
+        features, log_energy = audio_features(head)
+        # Skip the leading silence the segmenter keeps in front of each phrase
+        region = _speech_region(log_energy)
+        segment = features[region.start:]
+        return min(_dtw_score(segment, template, self.start_slack) for template in self.templates)
+
+    def detect(self, audio_data):
+        """True if ``audio_data`` starts with the wake word"""
+        return self.score(audio_data) <= self.threshold()
+
+
+def audio_features(audio_data):
+    """MFCC features for an ``sr.AudioData`` segment"""
+    samples = np.frombuffer(audio_data.get_raw_data(convert_width=2), dtype="<i2")
+    return pcm_features(samples, audio_data.sample_rate)
+
+
+def load_wav(path):
+    """Read a WAV/AIFF/FLAC file into an ``sr.AudioData``"""
+    with sr.AudioFile(path) as source:
+        return sr.Recognizer().record(source)
+
+
+def enroll(directory, count=5):
+    """Record ``count`` utterances of the wake word into ``directory``"""
+    os.makedirs(directory, exist_ok=True)
+    recognizer = sr.Recognizer()
+    with sr.Microphone() as source:
+        print("Adjusting for ambient noise... Please be quiet.")
+        recognizer.adjust_for_ambient_noise(source, duration=1)
+        existing = len(glob.glob(os.path.join(directory, "*.wav")))
+        for i in range(count):
+            print(f"({i + 1}/{count}) Say '{WAKE_WORD}'")
+            audio = recognizer.listen(source, timeout=10, phrase_time_limit=2)
+            path = os.path.join(directory, f"{WAKE_WORD}_{existing + i + 1:02d}.wav")
+            with open(path, "wb") as f:
+                f.write(audio.get_wav_data())
+            print(f"Saved {path}")
+
+
+def evaluate(spotter, corpus_dir, sensitivities=(0.1, 0.3, 0.5, 0.7, 0.9)):
+    """Count false accepts and false rejects over a labelled WAV corpus
+
+    ``corpus_dir`` holds ``positive/`` recordings that start with the wake word
+    and ``negative/`` recordings that do not. Returns one row per sensitivity.
+    """
+    scores = {}
+    for label in ("positive", "negative"):
+        paths = sorted(glob.glob(os.path.join(corpus_dir, label, "*.wav")))
+        scores[label] = [spotter.score(load_wav(path)) for path in paths]
+
+    report = []
+    for sensitivity in sensitivities:
+        threshold = spotter.threshold(sensitivity)
+        report.append({
+            'sensitivity': sensitivity,
+            'positives': len(scores['positive']),
+            'negatives': len(scores['negative']),
+            'false_rejects': sum(score > threshold for score in scores['positive']),
+            'false_accepts': sum(score <= threshold for score in scores['negative']),
+        })
+    return report
+
+
+def main():
+    usage = "Usage: python wake_word.py enroll [count] | evaluate <corpus_dir>"
+    directory = os.getenv('WAKE_WORD_DIR', 'wake_word')
+    if len(sys.argv) < 2:
+        print(usage)
+        return
+
+    if sys.argv[1] == "enroll":
+        enroll(directory, int(sys.argv[2]) if len(sys.argv) > 2 else 5)
+    elif sys.argv[1] == "evaluate" and len(sys.argv) > 2:
+        spotter = WakeWordSpotter.from_directory(directory)
+        if spotter is None:
+            print(f"No wake word recordings in {directory}; run: python wake_word.py enroll")
+            return
+        print(f"{'sensitivity':>11} {'false accepts':>14} {'false rejects':>14}")
+        for row in evaluate(spotter, sys.argv[2]):
+            print(f"{row['sensitivity']:>11.1f} "
+                  f"{row['false_accepts']:>6}/{row['negatives']:<7} "
+                  f"{row['false_rejects']:>6}/{row['positives']:<7}")
+    else:
+        print(usage)
+
+
+if __name__ == "__main__":
+    main()